@@ -161,10 +161,17 @@ CREATE TABLE IF NOT EXISTS symbols (
     lot_size        INTEGER DEFAULT 1,
     tick_size       DECIMAL(18, 8) DEFAULT 0.01,
     metadata        JSONB,
+    first_trade_at  TIMESTAMPTZ,  -- Set by the stream processor on first trade
     created_at      TIMESTAMPTZ DEFAULT NOW(),
     updated_at      TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Databases created before first_trade_at existed
+ALTER TABLE symbols ADD COLUMN IF NOT EXISTS first_trade_at TIMESTAMPTZ;
+
+-- Symbols with trade data, served by the API gateway's symbol list
+CREATE INDEX IF NOT EXISTS idx_symbols_traded ON symbols (symbol) WHERE first_trade_at IS NOT NULL;
+
 -- Insert default symbols
 INSERT INTO symbols (symbol, name, exchange, asset_type) VALUES
     ('AAPL', 'Apple Inc.', 'NASDAQ', 'STOCK'),
@@ -179,6 +186,16 @@ INSERT INTO symbols (symbol, name, exchange, asset_type) VALUES
     ('JNJ', 'Johnson & Johnson', 'NYSE', 'STOCK')
 ON CONFLICT (symbol) DO NOTHING;
 
+-- Backfill first_trade_at from existing trades, adding any traded symbol
+-- missing from the table (a no-op once every traded symbol is marked)
+INSERT INTO symbols (symbol, name, exchange, asset_type, first_trade_at)
+SELECT symbol, symbol, first(exchange, timestamp), 'STOCK', min(timestamp)
+FROM trades
+GROUP BY symbol
+ON CONFLICT (symbol) DO UPDATE
+    SET first_trade_at = EXCLUDED.first_trade_at
+    WHERE symbols.first_trade_at IS NULL;
+
 -- =============================================================================
 -- CONTINUOUS AGGREGATES
 -- =============================================================================
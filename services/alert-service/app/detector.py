@@ -8,47 +8,44 @@ Implements multiple detection strategies:
 - Rolling statistics with exponential moving averages
 """
 
-from collections import deque
-from dataclasses import dataclass, field
+import math
+import time
+from bisect import bisect_right
 from datetime import datetime
-from decimal import Decimal
-from typing import Dict
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
+from cachetools import TTLCache
 
 from finstream_common.models import Trade, Quote, Alert, AlertType, AlertSeverity
 from finstream_common.logging import get_logger
 from finstream_common.metrics import get_metrics
 
+from app.kernels import update_trade, update_trades
+
 logger = get_logger(__name__)
 metrics = get_metrics()
 
 
-@dataclass
-class SymbolStats:
-    """Rolling statistics for a symbol."""
-    
-    # Price statistics
-    prices: deque = field(default_factory=lambda: deque(maxlen=1000))
-    price_ema: float = 0.0
-    price_ema_variance: float = 0.0
-    
-    # Volume statistics
-    volumes: deque = field(default_factory=lambda: deque(maxlen=1000))
-    volume_ema: float = 0.0
-    
-    # Spread statistics
-    spreads: deque = field(default_factory=lambda: deque(maxlen=500))
-    spread_ema: float = 0.0
-    
-    # Tracking
-    last_price: float = 0.0
-    last_volume: int = 0
-    last_update: datetime | None = None
-    trade_count: int = 0
-    
-    # EMA smoothing factor
-    alpha: float = 0.01  # Slow EMA for baseline
+# Initial number of symbol slots; columns double when exhausted
+_INITIAL_CAPACITY = 64
+
+# Upper bound on (symbol, alert_type) cooldown entries
+_COOLDOWN_MAX_ENTRIES = 10_000
+
+# Maximum age of the get_all_stats() snapshot
+_SNAPSHOT_TTL_SECONDS = 1.0
+
+# Severity buckets: value >= _XXX_SEV_TH[i] maps to _SEVERITIES[i + 1]
+_SEVERITIES = (
+    AlertSeverity.LOW,
+    AlertSeverity.MEDIUM,
+    AlertSeverity.HIGH,
+    AlertSeverity.CRITICAL,
+)
+_PRICE_SEV_TH = (3.5, 4.0, 5.0)  # Z-score
+_VOLUME_SEV_TH = (7.0, 10.0, 20.0)  # Volume / EMA ratio
+_SPREAD_SEV_TH = (4.0, 5.0, 10.0)  # Spread / EMA ratio
 
 
 class AlertDetector:
@@ -59,6 +56,9 @@ class AlertDetector:
     1. Price Spike: Z-score > threshold (sudden price movements)
     2. Volume Anomaly: Volume >> EMA (unusual trading activity)
     3. Spread Anomaly: Spread >> normal (liquidity concerns)
+    
+    Rolling statistics are stored structure-of-arrays: one NumPy column
+    per statistic, indexed by a dense integer id interned per symbol.
     """
     
     def __init__(
@@ -82,36 +82,93 @@ class AlertDetector:
         self.spread_anomaly_multiplier = spread_anomaly_multiplier
         self.min_samples = min_samples
         
-        # Per-symbol statistics
-        self._stats: Dict[str, SymbolStats] = {}
+        # Squared threshold lets the kernel test spikes without a sqrt
+        self._price_thresh_sq = price_spike_threshold ** 2
+        
+        # EMA smoothing factor
+        self._alpha = 0.01  # Slow EMA for baseline
         
-        # Alert cooldown (prevent alert flooding)
-        self._last_alert: Dict[str, Dict[AlertType, datetime]] = {}
+        # Per-symbol statistics (SoA columns indexed by symbol id)
+        self._sym_id: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._price_ema = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._price_ema_var = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._volume_ema = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._spread_ema = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._trade_count = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self._spread_count = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self._last_price = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._last_update: List[datetime | None] = []
+        
+        # Alert cooldown (prevent alert flooding). A (symbol, alert_type) key
+        # is present exactly while that alert is cooling down; expiry is
+        # handled by the cache (monotonic clock) and the size is bounded.
         self._cooldown_seconds = 60  # Minimum time between same alert type
+        self._last_alert: TTLCache = TTLCache(
+            maxsize=_COOLDOWN_MAX_ENTRIES,
+            ttl=self._cooldown_seconds,
+        )
+        
+        # Cached get_all_stats() result
+        self._stats_snapshot: Dict[str, dict] = {}
+        self._snapshot_ts = float("-inf")
+        
+        # Bound alerts_triggered children keyed by (alert_type, severity, symbol)
+        self._counter_cache: Dict[Tuple[AlertType, AlertSeverity, str], Any] = {}
     
-    def _get_stats(self, symbol: str) -> SymbolStats:
-        """Get or create stats for a symbol."""
-        if symbol not in self._stats:
-            self._stats[symbol] = SymbolStats()
-        return self._stats[symbol]
+    def _symbol_id(self, symbol: str) -> int:
+        """Get or assign the column index for a symbol."""
+        sid = self._sym_id.get(symbol)
+        if sid is None:
+            sid = len(self._symbols)
+            if sid == self._price_ema.shape[0]:
+                self._grow()
+            self._sym_id[symbol] = sid
+            self._symbols.append(symbol)
+            self._last_update.append(None)
+        return sid
+    
+    def _grow(self) -> None:
+        """Double the capacity of every statistics column."""
+        for name in (
+            "_price_ema",
+            "_price_ema_var",
+            "_volume_ema",
+            "_spread_ema",
+            "_trade_count",
+            "_spread_count",
+            "_last_price",
+        ):
+            column = getattr(self, name)
+            grown = np.zeros(column.shape[0] * 2, dtype=column.dtype)
+            grown[: column.shape[0]] = column
+            setattr(self, name, grown)
     
     def _can_alert(self, symbol: str, alert_type: AlertType) -> bool:
         """Check if we can generate an alert (cooldown)."""
-        if symbol not in self._last_alert:
-            return True
-        
-        if alert_type not in self._last_alert[symbol]:
-            return True
-        
-        last_time = self._last_alert[symbol][alert_type]
-        elapsed = (datetime.utcnow() - last_time).total_seconds()
-        return elapsed >= self._cooldown_seconds
+        return (symbol, alert_type) not in self._last_alert
     
     def _record_alert(self, symbol: str, alert_type: AlertType) -> None:
         """Record that an alert was generated."""
-        if symbol not in self._last_alert:
-            self._last_alert[symbol] = {}
-        self._last_alert[symbol][alert_type] = datetime.utcnow()
+        self._last_alert[(symbol, alert_type)] = time.monotonic()
+    
+    def _alert_counter(
+        self,
+        alert_type: AlertType,
+        severity: AlertSeverity,
+        symbol: str,
+    ) -> Any:
+        """Get the alerts_triggered counter child for a label set."""
+        key = (alert_type, severity, symbol)
+        counter = self._counter_cache.get(key)
+        if counter is None:
+            counter = metrics.alerts_triggered.labels(
+                alert_type=alert_type.value,
+                severity=severity.value,
+                symbol=symbol,
+            )
+            self._counter_cache[key] = counter
+        return counter
     
     def process_trade(self, trade: Trade) -> Alert | None:
         """
@@ -123,48 +180,125 @@ class AlertDetector:
         Returns:
             Alert if anomaly detected, None otherwise
         """
-        stats = self._get_stats(trade.symbol)
+        sid = self._symbol_id(trade.symbol)
         price = float(trade.price)
         volume = trade.quantity
         
+        # Bind the columns once rather than re-resolving self.<attr>
+        price_ema_col = self._price_ema
+        price_ema_var_col = self._price_ema_var
+        volume_ema_col = self._volume_ema
+        trade_count_col = self._trade_count
+        
         alert = None
         
-        # Update statistics
-        stats.prices.append(price)
-        stats.volumes.append(volume)
-        stats.trade_count += 1
+        # Update EMAs and EMA variance (JIT-compiled)
+        price_ema, price_ema_var, volume_ema, z_score = update_trade(
+            price,
+            float(volume),
+            price_ema_col[sid],
+            price_ema_var_col[sid],
+            volume_ema_col[sid],
+            self._alpha,
+            self._price_thresh_sq,
+        )
+        trade_count = int(trade_count_col[sid]) + 1
         
-        # Update EMAs
-        if stats.price_ema == 0:
-            stats.price_ema = price
-            stats.volume_ema = volume
-        else:
-            # Exponential moving average
-            stats.price_ema = stats.alpha * price + (1 - stats.alpha) * stats.price_ema
-            stats.volume_ema = stats.alpha * volume + (1 - stats.alpha) * stats.volume_ema
-            
-            # Update EMA variance for price
-            diff_sq = (price - stats.price_ema) ** 2
-            stats.price_ema_variance = (
-                stats.alpha * diff_sq + (1 - stats.alpha) * stats.price_ema_variance
-            )
+        # Write the updated state back in one place
+        price_ema_col[sid] = price_ema
+        price_ema_var_col[sid] = price_ema_var
+        volume_ema_col[sid] = volume_ema
+        trade_count_col[sid] = trade_count
+        self._last_price[sid] = price
+        self._last_update[sid] = trade.timestamp
         
         # Only alert after collecting enough samples
-        if stats.trade_count >= self.min_samples:
-            # Check for price spike
-            alert = self._check_price_spike(trade, stats, price)
+        if trade_count >= self.min_samples:
+            # Check for price spike (skip the call in the common no-spike case)
+            if z_score >= self.price_spike_threshold:
+                alert = self._check_price_spike(trade, price, price_ema, z_score)
             
             # Check for volume anomaly if no price alert
             if alert is None:
-                alert = self._check_volume_anomaly(trade, stats, volume)
-        
-        # Update last values
-        stats.last_price = price
-        stats.last_volume = volume
-        stats.last_update = trade.timestamp
+                alert = self._check_volume_anomaly(trade, volume, volume_ema)
         
         return alert
     
+    def process_trades(self, trades: List[Trade]) -> List[Alert]:
+        """
+        Process a batch of trades and detect anomalies.
+        
+        Statistics for the whole batch are advanced in one JIT-compiled
+        pass; only trades whose post-update state crosses a threshold are
+        revisited in Python to build alerts.
+        
+        Args:
+            trades: Trades to analyze, in arrival order
+        
+        Returns:
+            Alerts generated by the batch (at most one per trade)
+        """
+        n = len(trades)
+        if n == 0:
+            return []
+        
+        ids = np.fromiter(
+            (self._symbol_id(t.symbol) for t in trades), dtype=np.int64, count=n
+        )
+        prices = np.fromiter((float(t.price) for t in trades), dtype=np.float64, count=n)
+        volumes = np.fromiter((t.quantity for t in trades), dtype=np.float64, count=n)
+        
+        ema_out = np.empty(n, dtype=np.float64)
+        vol_ema_out = np.empty(n, dtype=np.float64)
+        z_out = np.empty(n, dtype=np.float64)
+        count_out = np.empty(n, dtype=np.int64)
+        
+        update_trades(
+            ids,
+            prices,
+            volumes,
+            self._price_ema,
+            self._price_ema_var,
+            self._volume_ema,
+            self._trade_count,
+            self._last_price,
+            self._alpha,
+            self._price_thresh_sq,
+            ema_out,
+            vol_ema_out,
+            z_out,
+            count_out,
+        )
+        
+        last_update = self._last_update
+        for sid, trade in zip(ids.tolist(), trades):
+            last_update[sid] = trade.timestamp
+        
+        # Vectorized pre-filter: most trades never reach the alert checks
+        candidates = np.flatnonzero(
+            (count_out >= self.min_samples)
+            & (
+                (z_out >= self.price_spike_threshold)
+                | (volumes >= vol_ema_out * self.volume_anomaly_multiplier)
+            )
+        )
+        
+        alerts: List[Alert] = []
+        for k in candidates.tolist():
+            trade = trades[k]
+            price = float(prices[k])
+            alert = self._check_price_spike(
+                trade, price, float(ema_out[k]), float(z_out[k])
+            )
+            if alert is None:
+                alert = self._check_volume_anomaly(
+                    trade, trade.quantity, float(vol_ema_out[k])
+                )
+            if alert is not None:
+                alerts.append(alert)
+        
+        return alerts
+    
     def process_quote(self, quote: Quote) -> Alert | None:
         """
         Process a quote and detect spread anomalies.
@@ -175,227 +309,211 @@ class AlertDetector:
         Returns:
             Alert if anomaly detected, None otherwise
         """
-        stats = self._get_stats(quote.symbol)
-        spread = float(quote.ask_price - quote.bid_price)
+        sid = self._symbol_id(quote.symbol)
+        # Convert each side once and subtract as floats; Decimal arithmetic
+        # is far slower and the detector only needs float precision
+        spread = float(quote.ask_price) - float(quote.bid_price)
         
         # Update spread statistics
-        stats.spreads.append(spread)
+        spread_count = int(self._spread_count[sid]) + 1
+        self._spread_count[sid] = spread_count
         
         # Update spread EMA
-        if stats.spread_ema == 0:
-            stats.spread_ema = spread
+        spread_ema_col = self._spread_ema
+        spread_ema = float(spread_ema_col[sid])
+        if spread_ema == 0:
+            spread_ema = spread
         else:
-            stats.spread_ema = stats.alpha * spread + (1 - stats.alpha) * stats.spread_ema
+            spread_ema += self._alpha * (spread - spread_ema)
+        spread_ema_col[sid] = spread_ema
         
         # Check for spread anomaly
-        if len(stats.spreads) >= self.min_samples:
-            return self._check_spread_anomaly(quote, stats, spread)
+        if spread_count >= self.min_samples:
+            return self._check_spread_anomaly(quote, spread, spread_ema)
         
         return None
     
     def _check_price_spike(
         self,
         trade: Trade,
-        stats: SymbolStats,
         price: float,
+        price_ema: float,
+        z_score: float,
     ) -> Alert | None:
-        """Check for price spike anomaly using Z-score."""
-        if stats.price_ema_variance <= 0:
+        """
+        Check for price spike anomaly using the Z-score from the EMA kernel.
+        
+        The kernel reports a zero Z-score unless the trade crosses the
+        threshold with a positive EMA variance, so no separate variance
+        guard is needed.
+        """
+        if z_score < self.price_spike_threshold:
             return None
         
         if not self._can_alert(trade.symbol, AlertType.PRICE_SPIKE):
             return None
         
-        # Calculate Z-score
-        std_dev = np.sqrt(stats.price_ema_variance)
-        z_score = abs(price - stats.price_ema) / std_dev if std_dev > 0 else 0
-        
-        if z_score >= self.price_spike_threshold:
-            # Determine severity based on Z-score
-            if z_score >= 5.0:
-                severity = AlertSeverity.CRITICAL
-            elif z_score >= 4.0:
-                severity = AlertSeverity.HIGH
-            elif z_score >= 3.5:
-                severity = AlertSeverity.MEDIUM
-            else:
-                severity = AlertSeverity.LOW
-            
-            pct_change = ((price - stats.price_ema) / stats.price_ema) * 100
-            
-            alert = Alert(
-                alert_type=AlertType.PRICE_SPIKE,
-                symbol=trade.symbol,
-                severity=severity,
-                message=f"Price spike detected: {price:.2f} (Z-score: {z_score:.2f}, {pct_change:+.2f}%)",
-                details={
-                    "price": price,
-                    "ema": round(stats.price_ema, 2),
-                    "z_score": round(z_score, 2),
-                    "pct_change": round(pct_change, 2),
-                    "trade_id": trade.trade_id,
-                },
-            )
-            
-            self._record_alert(trade.symbol, AlertType.PRICE_SPIKE)
-            
-            metrics.alerts_triggered.labels(
-                alert_type=AlertType.PRICE_SPIKE.value,
-                severity=severity.value,
-                symbol=trade.symbol,
-            ).inc()
-            
-            logger.warning(
-                "price_spike_detected",
-                symbol=trade.symbol,
-                price=price,
-                z_score=z_score,
-                severity=severity.value,
-            )
-            
-            return alert
+        # Determine severity based on Z-score
+        severity = _SEVERITIES[bisect_right(_PRICE_SEV_TH, z_score)]
         
-        return None
+        pct_change = ((price - price_ema) / price_ema) * 100
+        
+        alert = Alert(
+            alert_type=AlertType.PRICE_SPIKE,
+            symbol=trade.symbol,
+            severity=severity,
+            message=f"Price spike detected: {price:.2f} (Z-score: {z_score:.2f}, {pct_change:+.2f}%)",
+            details={
+                "price": price,
+                "ema": round(price_ema, 2),
+                "z_score": round(z_score, 2),
+                "pct_change": round(pct_change, 2),
+                "trade_id": trade.trade_id,
+            },
+        )
+        
+        self._record_alert(trade.symbol, AlertType.PRICE_SPIKE)
+        
+        self._alert_counter(AlertType.PRICE_SPIKE, severity, trade.symbol).inc()
+        
+        logger.warning(
+            "price_spike_detected",
+            symbol=trade.symbol,
+            price=price,
+            z_score=z_score,
+            severity=severity.value,
+        )
+        
+        return alert
     
     def _check_volume_anomaly(
         self,
         trade: Trade,
-        stats: SymbolStats,
         volume: int,
+        volume_ema: float,
     ) -> Alert | None:
         """Check for volume anomaly."""
-        if stats.volume_ema <= 0:
+        if volume_ema <= 0:
+            return None
+        
+        if volume < volume_ema * self.volume_anomaly_multiplier:
             return None
         
         if not self._can_alert(trade.symbol, AlertType.VOLUME_ANOMALY):
             return None
         
-        volume_ratio = volume / stats.volume_ema
-        
-        if volume_ratio >= self.volume_anomaly_multiplier:
-            # Determine severity
-            if volume_ratio >= 20:
-                severity = AlertSeverity.CRITICAL
-            elif volume_ratio >= 10:
-                severity = AlertSeverity.HIGH
-            elif volume_ratio >= 7:
-                severity = AlertSeverity.MEDIUM
-            else:
-                severity = AlertSeverity.LOW
-            
-            alert = Alert(
-                alert_type=AlertType.VOLUME_ANOMALY,
-                symbol=trade.symbol,
-                severity=severity,
-                message=f"Volume anomaly: {volume:,} shares ({volume_ratio:.1f}x normal)",
-                details={
-                    "volume": volume,
-                    "volume_ema": round(stats.volume_ema, 0),
-                    "volume_ratio": round(volume_ratio, 2),
-                    "trade_id": trade.trade_id,
-                },
-            )
-            
-            self._record_alert(trade.symbol, AlertType.VOLUME_ANOMALY)
-            
-            metrics.alerts_triggered.labels(
-                alert_type=AlertType.VOLUME_ANOMALY.value,
-                severity=severity.value,
-                symbol=trade.symbol,
-            ).inc()
-            
-            logger.warning(
-                "volume_anomaly_detected",
-                symbol=trade.symbol,
-                volume=volume,
-                ratio=volume_ratio,
-                severity=severity.value,
-            )
-            
-            return alert
+        volume_ratio = volume / volume_ema
         
-        return None
+        # Determine severity
+        severity = _SEVERITIES[bisect_right(_VOLUME_SEV_TH, volume_ratio)]
+        
+        alert = Alert(
+            alert_type=AlertType.VOLUME_ANOMALY,
+            symbol=trade.symbol,
+            severity=severity,
+            message=f"Volume anomaly: {volume:,} shares ({volume_ratio:.1f}x normal)",
+            details={
+                "volume": volume,
+                "volume_ema": round(volume_ema, 0),
+                "volume_ratio": round(volume_ratio, 2),
+                "trade_id": trade.trade_id,
+            },
+        )
+        
+        self._record_alert(trade.symbol, AlertType.VOLUME_ANOMALY)
+        
+        self._alert_counter(AlertType.VOLUME_ANOMALY, severity, trade.symbol).inc()
+        
+        logger.warning(
+            "volume_anomaly_detected",
+            symbol=trade.symbol,
+            volume=volume,
+            ratio=volume_ratio,
+            severity=severity.value,
+        )
+        
+        return alert
     
     def _check_spread_anomaly(
         self,
         quote: Quote,
-        stats: SymbolStats,
         spread: float,
+        spread_ema: float,
     ) -> Alert | None:
         """Check for spread anomaly."""
-        if stats.spread_ema <= 0:
+        if spread_ema <= 0:
+            return None
+        
+        if spread < spread_ema * self.spread_anomaly_multiplier:
             return None
         
         if not self._can_alert(quote.symbol, AlertType.SPREAD_ANOMALY):
             return None
         
-        spread_ratio = spread / stats.spread_ema
-        
-        if spread_ratio >= self.spread_anomaly_multiplier:
-            # Determine severity
-            if spread_ratio >= 10:
-                severity = AlertSeverity.CRITICAL
-            elif spread_ratio >= 5:
-                severity = AlertSeverity.HIGH
-            elif spread_ratio >= 4:
-                severity = AlertSeverity.MEDIUM
-            else:
-                severity = AlertSeverity.LOW
-            
-            alert = Alert(
-                alert_type=AlertType.SPREAD_ANOMALY,
-                symbol=quote.symbol,
-                severity=severity,
-                message=f"Spread anomaly: ${spread:.4f} ({spread_ratio:.1f}x normal)",
-                details={
-                    "spread": spread,
-                    "spread_ema": round(stats.spread_ema, 4),
-                    "spread_ratio": round(spread_ratio, 2),
-                    "bid": float(quote.bid_price),
-                    "ask": float(quote.ask_price),
-                },
-            )
-            
-            self._record_alert(quote.symbol, AlertType.SPREAD_ANOMALY)
-            
-            metrics.alerts_triggered.labels(
-                alert_type=AlertType.SPREAD_ANOMALY.value,
-                severity=severity.value,
-                symbol=quote.symbol,
-            ).inc()
-            
-            logger.warning(
-                "spread_anomaly_detected",
-                symbol=quote.symbol,
-                spread=spread,
-                ratio=spread_ratio,
-                severity=severity.value,
-            )
-            
-            return alert
+        spread_ratio = spread / spread_ema
         
-        return None
+        # Determine severity
+        severity = _SEVERITIES[bisect_right(_SPREAD_SEV_TH, spread_ratio)]
+        
+        alert = Alert(
+            alert_type=AlertType.SPREAD_ANOMALY,
+            symbol=quote.symbol,
+            severity=severity,
+            message=f"Spread anomaly: ${spread:.4f} ({spread_ratio:.1f}x normal)",
+            details={
+                "spread": spread,
+                "spread_ema": round(spread_ema, 4),
+                "spread_ratio": round(spread_ratio, 2),
+                "bid": float(quote.bid_price),
+                "ask": float(quote.ask_price),
+            },
+        )
+        
+        self._record_alert(quote.symbol, AlertType.SPREAD_ANOMALY)
+        
+        self._alert_counter(AlertType.SPREAD_ANOMALY, severity, quote.symbol).inc()
+        
+        logger.warning(
+            "spread_anomaly_detected",
+            symbol=quote.symbol,
+            spread=spread,
+            ratio=spread_ratio,
+            severity=severity.value,
+        )
+        
+        return alert
     
     def get_stats(self, symbol: str) -> dict | None:
         """Get current statistics for a symbol."""
-        if symbol not in self._stats:
+        sid = self._sym_id.get(symbol)
+        if sid is None:
             return None
         
-        stats = self._stats[symbol]
+        price_ema_var = float(self._price_ema_var[sid])
+        last_update = self._last_update[sid]
         return {
             "symbol": symbol,
-            "price_ema": round(stats.price_ema, 2),
-            "price_std": round(np.sqrt(stats.price_ema_variance), 4) if stats.price_ema_variance > 0 else 0,
-            "volume_ema": round(stats.volume_ema, 0),
-            "spread_ema": round(stats.spread_ema, 4),
-            "trade_count": stats.trade_count,
-            "last_price": stats.last_price,
-            "last_update": stats.last_update.isoformat() if stats.last_update else None,
+            "price_ema": round(float(self._price_ema[sid]), 2),
+            "price_std": round(math.sqrt(price_ema_var), 4) if price_ema_var > 0 else 0,
+            "volume_ema": round(float(self._volume_ema[sid]), 0),
+            "spread_ema": round(float(self._spread_ema[sid]), 4),
+            "trade_count": int(self._trade_count[sid]),
+            "last_price": float(self._last_price[sid]),
+            "last_update": last_update.isoformat() if last_update else None,
         }
     
     def get_all_stats(self) -> Dict[str, dict]:
-        """Get statistics for all symbols."""
-        return {
-            symbol: self.get_stats(symbol)
-            for symbol in self._stats.keys()
-        }
+        """
+        Get statistics for all symbols.
+        
+        Served from a snapshot rebuilt at most once per
+        _SNAPSHOT_TTL_SECONDS, so frequent polling stays O(1).
+        """
+        now = time.monotonic()
+        if now - self._snapshot_ts > _SNAPSHOT_TTL_SECONDS:
+            self._stats_snapshot = {
+                symbol: self.get_stats(symbol)
+                for symbol in self._symbols
+            }
+            self._snapshot_ts = now
+        return self._stats_snapshot
@@ -0,0 +1,124 @@
+"""
+Numba kernels for the alert detector hot path.
+
+The EMA recursion is sequential per symbol, so it cannot be vectorized
+with NumPy; compiling the scalar update removes the interpreter overhead
+instead.
+"""
+
+import math
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def update_trade(
+    price: float,
+    volume: float,
+    ema: float,
+    ema_var: float,
+    vol_ema: float,
+    alpha: float,
+    thresh_sq: float,
+) -> tuple[float, float, float, float]:
+    """
+    Advance the price EMA, EMA variance and volume EMA by one trade.
+
+    The first trade for a symbol (ema == 0) seeds the averages. The
+    variance is fed the deviation from the updated EMA, as in the original
+    per-symbol detector.
+
+    The spike test |x - ema| / std >= T is evaluated as
+    (x - ema)^2 >= T^2 * var, so the square root is only taken for
+    trades that actually cross the threshold.
+
+    Returns:
+        Tuple of (price_ema, price_ema_variance, volume_ema, z_score), where
+        z_score is 0.0 unless it reaches sqrt(thresh_sq)
+    """
+    if ema == 0.0:
+        return price, ema_var, volume, 0.0
+
+    ema2 = ema + alpha * (price - ema)
+    dev = price - ema2
+    ema_var2 = ema_var + alpha * (dev * dev - ema_var)
+    vol_ema2 = vol_ema + alpha * (volume - vol_ema)
+
+    z_score = 0.0
+    if ema_var2 > 0.0 and dev * dev >= thresh_sq * ema_var2:
+        z_score = abs(dev) / math.sqrt(ema_var2)
+    return ema2, ema_var2, vol_ema2, z_score
+
+
+@njit(cache=True, fastmath=True)
+def update_trades(
+    ids: np.ndarray,
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    price_ema: np.ndarray,
+    price_ema_var: np.ndarray,
+    volume_ema: np.ndarray,
+    trade_count: np.ndarray,
+    last_price: np.ndarray,
+    alpha: float,
+    thresh_sq: float,
+    ema_out: np.ndarray,
+    vol_ema_out: np.ndarray,
+    z_out: np.ndarray,
+    count_out: np.ndarray,
+) -> None:
+    """
+    Apply a batch of trades to the per-symbol state columns in arrival order.
+
+    State columns are indexed by symbol id and updated in place. The
+    ``*_out`` arrays receive, per trade, the state right after that trade
+    was applied, which is what the alert checks compare against.
+    """
+    for k in range(ids.shape[0]):
+        i = ids[k]
+        ema, ema_var, vol_ema, z_score = update_trade(
+            prices[k],
+            volumes[k],
+            price_ema[i],
+            price_ema_var[i],
+            volume_ema[i],
+            alpha,
+            thresh_sq,
+        )
+        price_ema[i] = ema
+        price_ema_var[i] = ema_var
+        volume_ema[i] = vol_ema
+        trade_count[i] += 1
+        last_price[i] = prices[k]
+
+        ema_out[k] = ema
+        vol_ema_out[k] = vol_ema
+        z_out[k] = z_score
+        count_out[k] = trade_count[i]
+
+
+def warm_up() -> None:
+    """Compile (or load from cache) all kernels before the first event."""
+    update_trade(1.0, 1.0, 1.0, 0.0, 1.0, 0.01, 9.0)
+
+    ids = np.zeros(1, dtype=np.int64)
+    values = np.ones(1, dtype=np.float64)
+    state = np.zeros(1, dtype=np.float64)
+    counts = np.zeros(1, dtype=np.int64)
+    update_trades(
+        ids,
+        values,
+        values,
+        state.copy(),
+        state.copy(),
+        state.copy(),
+        counts.copy(),
+        state.copy(),
+        0.01,
+        9.0,
+        np.empty(1),
+        np.empty(1),
+        np.empty(1),
+        np.empty(1, dtype=np.int64),
+    )
@@ -19,9 +19,10 @@ from finstream_common.kafka import KafkaConsumer, KafkaProducer
 from finstream_common.logging import setup_logging, get_logger
 from finstream_common.metrics import setup_metrics, get_metrics
 from finstream_common.tracing import setup_tracing
-from finstream_common.models import Trade, Quote
+from finstream_common.models import Alert, Trade, Quote
 
 from app.detector import AlertDetector
+from app.kernels import warm_up as warm_up_kernels
 
 # Initialize
 settings = get_settings()
@@ -30,10 +31,22 @@ setup_tracing(service_name="alert-service", settings=settings)
 metrics = setup_metrics(service_name="alert-service", settings=settings)
 logger = get_logger(__name__)
 
+# Kafka batch polling
+CONSUMER_POLL_TIMEOUT_MS = 50
+CONSUMER_MAX_RECORDS = 500
+
+# Background alert publishing
+ALERT_QUEUE_SIZE = 10_000
+ALERT_PUBLISH_BATCH = 100
+
 
 class AlertService:
     """
     Main service that monitors market data for anomalies.
+    
+    Detector state is per symbol and producers key messages by symbol, so
+    the service shards by Kafka partition: every worker process joins the
+    same consumer groups and owns the symbols of its assigned partitions.
     """
     
     def __init__(self) -> None:
@@ -44,6 +57,14 @@ class AlertService:
         self.detector = AlertDetector()
         self._running = False
         self._tasks: list[asyncio.Task] = []
+        self._publisher_task: asyncio.Task | None = None
+        
+        # Alerts waiting for the background publisher; bounded so a stalled
+        # Kafka/Redis applies backpressure to the monitor loops. None tells
+        # the publisher to stop once everything queued before it is sent.
+        self._alert_queue: asyncio.Queue[Alert | None] = asyncio.Queue(
+            maxsize=ALERT_QUEUE_SIZE
+        )
         
         # Statistics
         self.trades_processed = 0
@@ -54,6 +75,10 @@ class AlertService:
         """Start the alert service."""
         logger.info("starting_alert_service")
         
+        # Compile detector kernels before consuming so the first trade
+        # doesn't pay the JIT cost
+        warm_up_kernels()
+        
         # Initialize Redis for pub/sub
         self.redis_client = redis.from_url(
             settings.redis_url,
@@ -84,6 +109,7 @@ class AlertService:
             asyncio.create_task(self._trade_monitor_loop()),
             asyncio.create_task(self._quote_monitor_loop()),
         ]
+        self._publisher_task = asyncio.create_task(self._alert_publisher_loop())
         
         logger.info("alert_service_started")
     
@@ -93,12 +119,18 @@ class AlertService:
         
         self._running = False
         
-        # Cancel tasks
+        # Cancel the monitor loops so no new alerts are queued
         for task in self._tasks:
             task.cancel()
         
         await asyncio.gather(*self._tasks, return_exceptions=True)
         
+        # Let the publisher finish its current batch and everything still
+        # queued, then exit on the sentinel
+        if self._publisher_task and not self._publisher_task.done():
+            await self._alert_queue.put(None)
+            await asyncio.gather(self._publisher_task, return_exceptions=True)
+        
         # Stop consumers
         if self.trade_consumer:
             await self.trade_consumer.stop()
@@ -116,31 +148,33 @@ class AlertService:
         logger.info("alert_service_stopped")
     
     async def _trade_monitor_loop(self) -> None:
-        """Monitor trades for anomalies."""
+        """Monitor trades for anomalies, one Kafka poll batch at a time."""
         logger.info("trade_monitor_loop_started")
         
         while self._running:
             try:
-                async for msg in self.trade_consumer.messages():
-                    if not self._running:
-                        break
-                    
+                batch = await self.trade_consumer.getmany(
+                    timeout_ms=CONSUMER_POLL_TIMEOUT_MS,
+                    max_records=CONSUMER_MAX_RECORDS,
+                )
+                if not batch:
+                    continue
+                
+                trades = []
+                for msg in batch:
                     try:
-                        # Deserialize trade
-                        trade = Trade.from_json(msg["value"])
-                        
-                        # Process through detector
-                        alert = self.detector.process_trade(trade)
-                        
-                        self.trades_processed += 1
-                        
-                        if alert:
-                            await self._publish_alert(alert)
-                            self.alerts_generated += 1
-                        
+                        trades.append(Trade.from_json(msg["value"]))
                     except Exception as e:
                         logger.exception("trade_monitor_error", error=str(e))
                 
+                # Process the whole batch through the detector
+                alerts = self.detector.process_trades(trades)
+                self.trades_processed += len(trades)
+                
+                for alert in alerts:
+                    await self._alert_queue.put(alert)
+                self.alerts_generated += len(alerts)
+                
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -148,15 +182,20 @@ class AlertService:
                 await asyncio.sleep(1)
     
     async def _quote_monitor_loop(self) -> None:
-        """Monitor quotes for spread anomalies."""
+        """Monitor quotes for spread anomalies, one Kafka poll batch at a time."""
         logger.info("quote_monitor_loop_started")
         
         while self._running:
             try:
-                async for msg in self.quote_consumer.messages():
-                    if not self._running:
-                        break
-                    
+                batch = await self.quote_consumer.getmany(
+                    timeout_ms=CONSUMER_POLL_TIMEOUT_MS,
+                    max_records=CONSUMER_MAX_RECORDS,
+                )
+                if not batch:
+                    continue
+                
+                alerts = []
+                for msg in batch:
                     try:
                         # Deserialize quote
                         quote = Quote.from_json(msg["value"])
@@ -167,44 +206,78 @@ class AlertService:
                         self.quotes_processed += 1
                         
                         if alert:
-                            await self._publish_alert(alert)
-                            self.alerts_generated += 1
+                            alerts.append(alert)
                         
                     except Exception as e:
                         logger.exception("quote_monitor_error", error=str(e))
                 
+                for alert in alerts:
+                    await self._alert_queue.put(alert)
+                self.alerts_generated += len(alerts)
+                
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.exception("quote_consumer_error", error=str(e))
                 await asyncio.sleep(1)
     
-    async def _publish_alert(self, alert) -> None:
+    async def _alert_publisher_loop(self) -> None:
+        """
+        Drain the alert queue, publishing up to a batch of alerts concurrently.
+        
+        Runs until it takes the None sentinel queued by ``stop()``, so alerts
+        already pulled into a batch are always published.
+        """
+        logger.info("alert_publisher_loop_started")
+        
+        stopping = False
+        while not stopping:
+            try:
+                batch: list[Alert] = []
+                alert = await self._alert_queue.get()
+                while True:
+                    if alert is None:
+                        stopping = True
+                        break
+                    batch.append(alert)
+                    if len(batch) >= ALERT_PUBLISH_BATCH or self._alert_queue.empty():
+                        break
+                    alert = self._alert_queue.get_nowait()
+                
+                await asyncio.gather(*(self._publish_alert(a) for a in batch))
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.exception("alert_publisher_error", error=str(e))
+                await asyncio.sleep(1)
+    
+    async def _publish_alert(self, alert: Alert) -> None:
         """Publish alert to Kafka and Redis pub/sub."""
         try:
-            # Publish to Kafka alerts topic
-            await self.producer.send(
-                topic=settings.topic_alerts,
-                value=alert.to_json(),
-                key=alert.symbol,
+            # Serialize once for both sinks (orjson bytes, published as-is)
+            payload = alert.to_json()
+            
+            # Publish to Redis for real-time WebSocket delivery, per-symbol
+            # and global channels in a single round-trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.publish(f"alerts:{alert.symbol}", payload)
+            pipe.publish("alerts:all", payload)
+            
+            # Publish to Kafka alerts topic concurrently with Redis
+            await asyncio.gather(
+                self.producer.send(
+                    topic=settings.topic_alerts,
+                    value=payload,
+                    key=alert.symbol,
+                ),
+                pipe.execute(),
             )
             
             metrics.kafka_messages_sent.labels(
                 topic=settings.topic_alerts
             ).inc()
             
-            # Publish to Redis for real-time WebSocket delivery
-            await self.redis_client.publish(
-                f"alerts:{alert.symbol}",
-                alert.to_json().decode(),
-            )
-            
-            # Also publish to global alerts channel
-            await self.redis_client.publish(
-                "alerts:all",
-                alert.to_json().decode(),
-            )
-            
             logger.info(
                 "alert_published",
                 alert_id=alert.alert_id,
@@ -293,13 +366,22 @@ async def symbol_stats(symbol: str) -> dict:
 
 
 def main() -> None:
-    """Main entry point."""
+    """
+    Main entry point.
+    
+    Outside development, runs ``settings.alert_workers`` worker processes.
+    Each one is a full AlertService consuming a share of the partitions, so
+    ``/stats`` reflects only the worker that served the request.
+    """
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8002,
+        loop="uvloop",
+        http="httptools",
         log_level="info",
         reload=settings.is_development,
+        workers=1 if settings.is_development else settings.alert_workers,
     )
 
 
@@ -5,15 +5,18 @@ REST API + WebSocket endpoints for real-time data streaming.
 """
 
 import asyncio
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import AsyncIterator, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
 
 import uvicorn
 import asyncpg
+import orjson
 import redis.asyncio as redis
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException, Response
+from fastapi import FastAPI, WebSocket, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.openapi.utils import get_openapi
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from pydantic import BaseModel, Field
@@ -30,6 +33,45 @@ setup_tracing(service_name="api-gateway", settings=settings)
 metrics = setup_metrics(service_name="api-gateway", settings=settings)
 logger = get_logger(__name__)
 
+# Redis keys for cached REST responses. The stream processor deletes the
+# symbols key when it sees a new symbol.
+SYMBOLS_CACHE_KEY = "cache:symbols:v1"
+MARKET_SUMMARY_CACHE_KEY = "cache:market_summary:v1"
+
+# Hot-path queries. asyncpg keeps a per-connection cache of prepared
+# statements keyed by query text, so fixed module-level SQL is parsed and
+# planned once per pooled connection rather than once per request.
+QUOTE_SQL = """
+    SELECT timestamp, symbol, bid_price, bid_size, ask_price, ask_size, exchange
+    FROM quotes WHERE symbol = $1 ORDER BY timestamp DESC LIMIT 1
+"""
+TRADES_SQL = """
+    SELECT timestamp, trade_id, symbol, price, quantity, side, exchange
+    FROM trades WHERE symbol = $1 ORDER BY timestamp DESC LIMIT $2
+"""
+CANDLES_SQL = """
+    SELECT timestamp, symbol, interval, open, high, low, close, volume, trade_count, vwap
+    FROM candles WHERE symbol = $1 AND interval = $2 ORDER BY timestamp DESC LIMIT $3
+"""
+
+# Alert queries indexed by filter mask: 1 = symbol, 2 = severity
+_ALERTS_SELECT = """
+    SELECT timestamp, alert_id, symbol, alert_type, severity, message, details
+    FROM alerts
+"""
+ALERTS_SQL = {
+    0: _ALERTS_SELECT + "ORDER BY timestamp DESC LIMIT $1",
+    1: _ALERTS_SELECT + "WHERE symbol = $1 ORDER BY timestamp DESC LIMIT $2",
+    2: _ALERTS_SELECT + "WHERE severity = $1 ORDER BY timestamp DESC LIMIT $2",
+    3: _ALERTS_SELECT + "WHERE symbol = $1 AND severity = $2 ORDER BY timestamp DESC LIMIT $3",
+}
+
+# Messages buffered per WebSocket before the oldest are dropped
+WS_SEND_QUEUE_SIZE = 256
+
+# Rows fetched from the server-side cursor per chunk of a streamed response
+STREAM_BATCH_SIZE = 100
+
 
 # ============================================================================
 # Pydantic Models for API Documentation
@@ -110,34 +152,111 @@ class SymbolsResponse(BaseModel):
     symbols: List[str] = Field(example=["AAPL", "GOOGL", "MSFT"])
 
 
-class ConnectionManager:
-    """Manage WebSocket connections."""
+class RedisFanoutHub:
+    """Multiplex Redis pub/sub channels onto in-process subscriber queues.
     
-    def __init__(self):
-        self.active_connections: dict[str, List[WebSocket]] = {}
+    The hub owns a single pubsub connection and one reader task. Each
+    WebSocket gets its own queue; the first queue on a channel issues
+    SUBSCRIBE and the last one to leave issues UNSUBSCRIBE, so Redis only
+    delivers channels somebody is watching and filters them by symbol.
+    
+    Queues are bounded. When a client falls behind, its oldest pending
+    message is dropped so it cannot stall the reader or grow without limit.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._pubsub = None
+        # Keyed by encoded channel name, as delivered by Redis
+        self._queues: dict[bytes, set[asyncio.Queue]] = {}
+        self._subscribed = asyncio.Event()
+        self._dropped = metrics.ws_messages_dropped.labels(channel=name)
     
-    async def connect(self, websocket: WebSocket, channel: str):
-        await websocket.accept()
-        if channel not in self.active_connections:
-            self.active_connections[channel] = []
-        self.active_connections[channel].append(websocket)
-        logger.info("ws_connected", channel=channel)
+    def start(self, redis_client: redis.Redis) -> asyncio.Task:
+        self._pubsub = redis_client.pubsub()
+        return asyncio.create_task(self._reader())
     
-    def disconnect(self, websocket: WebSocket, channel: str):
-        if channel in self.active_connections:
-            self.active_connections[channel].remove(websocket)
-        logger.info("ws_disconnected", channel=channel)
+    async def stop(self):
+        if self._pubsub is not None:
+            await self._pubsub.close()
     
-    async def broadcast(self, channel: str, message: str):
-        if channel in self.active_connections:
-            for connection in self.active_connections[channel]:
-                try:
-                    await connection.send_text(message)
-                except Exception:
-                    pass
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        """Yield a queue receiving the raw bytes of every message on ``channel``."""
+        key = channel.encode()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        queues = self._queues.setdefault(key, set())
+        queues.add(queue)
+        if len(queues) == 1:
+            await self._pubsub.subscribe(channel)
+            self._subscribed.set()
+        try:
+            yield queue
+        finally:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[key]
+                await self._pubsub.unsubscribe(channel)
+    
+    async def _reader(self):
+        while True:
+            try:
+                # listen() returns once nothing is subscribed; wait for the
+                # next subscription instead of spinning
+                if not self._pubsub.subscribed:
+                    self._subscribed.clear()
+                    await self._subscribed.wait()
+                async for message in self._pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = message["data"]
+                    for queue in self._queues.get(message["channel"], ()):
+                        if queue.full():
+                            queue.get_nowait()
+                            self._dropped.inc()
+                        queue.put_nowait(data)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.exception("fanout_hub_error", hub=self.name, error=str(e))
+                await asyncio.sleep(1)
 
 
-manager = ConnectionManager()
+# One hub, and so one Redis connection, per event type so a burst of quotes
+# does not queue trades and alerts behind it
+hubs = {name: RedisFanoutHub(name) for name in ("quotes", "trades", "alerts")}
+
+
+async def stream_channel(websocket: WebSocket, hub: RedisFanoutHub, channel: str):
+    """Relay a Redis channel to a WebSocket until the client disconnects.
+    
+    Messages that pile up while a send is in flight go out together as one
+    JSON array frame, so a busy channel costs one write per burst.
+    """
+    await websocket.accept()
+    logger.info("ws_connected", channel=channel)
+    
+    async def send_loop(queue: asyncio.Queue):
+        while True:
+            messages = [await queue.get()]
+            while not queue.empty():
+                messages.append(queue.get_nowait())
+            await websocket.send_bytes(b"[" + b",".join(messages) + b"]")
+    
+    async with hub.subscribe(channel) as queue:
+        sender = asyncio.create_task(send_loop(queue))
+        try:
+            # Inbound frames are only watched for disconnects, so take the raw
+            # ASGI events without decoding them
+            while True:
+                event = await websocket.receive()
+                if event["type"] == "websocket.disconnect":
+                    break
+        finally:
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+    
+    logger.info("ws_disconnected", channel=channel)
 
 
 class APIGateway:
@@ -152,22 +271,29 @@ class APIGateway:
     async def start(self):
         logger.info("starting_api_gateway")
         
-        # Connect to TimescaleDB
+        # Connect to TimescaleDB. The pool is opened at full size so requests
+        # never wait on connection setup; JIT is off because these are short
+        # indexed reads where compilation costs more than it saves. The
+        # configured pool size is split across workers to bound the total.
+        pool_size = max(1, settings.timescale_pool_size // worker_count())
         self.db_pool = await asyncpg.create_pool(
             dsn=settings.timescale_url,
-            min_size=5,
-            max_size=settings.timescale_pool_size,
+            min_size=pool_size,
+            max_size=pool_size,
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=1024,
+            command_timeout=5,
+            server_settings={"application_name": "api-gateway", "jit": "off"},
         )
         
         # Connect to Redis
-        self.redis_client = redis.from_url(settings.redis_url)
+        # Responses stay bytes so pub/sub payloads reach WebSockets unchanged
+        self.redis_client = redis.from_url(settings.redis_url, decode_responses=False)
         
         self._running = True
         
-        # Start Redis subscriber for real-time updates
-        self._tasks = [
-            asyncio.create_task(self._redis_subscriber()),
-        ]
+        # Start the Redis fan-out hubs for real-time updates
+        self._tasks = [hub.start(self.redis_client) for hub in hubs.values()]
         
         logger.info("api_gateway_started")
     
@@ -178,6 +304,8 @@ class APIGateway:
         for task in self._tasks:
             task.cancel()
         await asyncio.gather(*self._tasks, return_exceptions=True)
+        for hub in hubs.values():
+            await hub.stop()
         
         if self.db_pool:
             await self.db_pool.close()
@@ -186,28 +314,45 @@ class APIGateway:
         
         logger.info("api_gateway_stopped")
     
-    async def _redis_subscriber(self):
-        """Subscribe to Redis channels and broadcast to WebSocket clients."""
-        pubsub = self.redis_client.pubsub()
-        await pubsub.psubscribe("quotes:*", "trades:*", "alerts:*")
-        
-        while self._running:
-            try:
-                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
-                if message:
-                    channel = message["channel"].decode() if isinstance(message["channel"], bytes) else message["channel"]
-                    data = message["data"].decode() if isinstance(message["data"], bytes) else message["data"]
-                    await manager.broadcast(channel, data)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.exception("redis_subscriber_error", error=str(e))
-                await asyncio.sleep(1)
-        
-        await pubsub.unsubscribe()
+gateway = APIGateway()
 
 
-gateway = APIGateway()
+def trade_row(r: asyncpg.Record) -> dict:
+    """Convert a ``TRADES_SQL`` row into its JSON shape."""
+    return {
+        "timestamp": r[0],
+        "trade_id": r[1],
+        "symbol": r[2],
+        "price": float(r[3]),
+        "quantity": r[4],
+        "side": r[5],
+        "exchange": r[6],
+    }
+
+
+async def cached(key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the value cached in Redis under ``key``, loading it on a miss.
+    
+    Values are stored as JSON with ``ttl`` seconds to live. Decimal columns
+    are serialized as floats, matching the response models. Redis errors
+    are logged and fall through to ``loader`` so the cache never fails a
+    request.
+    """
+    try:
+        value = await gateway.redis_client.get(key)
+    except redis.RedisError as e:
+        logger.warning("response_cache_read_failed", key=key, error=str(e))
+        value = None
+    if value is not None:
+        return orjson.loads(value)
+    
+    result = await loader()
+    try:
+        await gateway.redis_client.setex(key, ttl, orjson.dumps(result, default=float))
+    except redis.RedisError as e:
+        logger.warning("response_cache_write_failed", key=key, error=str(e))
+    return result
 
 
 @asynccontextmanager
@@ -241,6 +386,9 @@ Most endpoints are public. Portfolio and trading endpoints require JWT authentic
 - `/ws/quotes/{symbol}` - Real-time quote updates
 - `/ws/trades/{symbol}` - Real-time trade feed
 - `/ws/alerts` - Market alert notifications
+
+Each WebSocket message is a JSON array; events that arrive while the previous
+message is being sent are batched into the next one.
     """,
     version="1.0.0",
     lifespan=lifespan,
@@ -252,6 +400,7 @@ Most endpoints are public. Portfolio and trading endpoints require JWT authentic
     ],
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -268,10 +417,26 @@ app.add_middleware(
 # Health & Metrics Endpoints
 # ============================================================================
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
+# Encoded /health body, rebuilt at most once per second
+_health_cache: dict[str, Any] = {"second": -1, "body": b""}
+
+
+@app.get("/health", responses={200: {"model": HealthResponse}}, tags=["Health"])
 async def health():
     """Check service health status."""
-    return {"status": "healthy", "service": "api-gateway", "timestamp": datetime.utcnow().isoformat()}
+    second = int(time.time())
+    if _health_cache["second"] != second:
+        _health_cache["second"] = second
+        _health_cache["body"] = orjson.dumps({
+            "status": "healthy",
+            "service": "api-gateway",
+            "timestamp": datetime.utcfromtimestamp(second).isoformat(),
+        })
+    return Response(
+        content=_health_cache["body"],
+        media_type="application/json",
+        headers={"Cache-Control": "max-age=1"},
+    )
 
 
 @app.get("/ready", tags=["Health"])
@@ -298,13 +463,16 @@ async def get_symbols():
     
     Returns a list of stock ticker symbols that have trading data available.
     """
-    query = "SELECT DISTINCT symbol FROM trades ORDER BY symbol"
-    async with gateway.db_pool.acquire() as conn:
-        rows = await conn.fetch(query)
-    return {"symbols": [row["symbol"] for row in rows]}
+    async def load() -> list[str]:
+        query = "SELECT symbol FROM symbols WHERE first_trade_at IS NOT NULL ORDER BY symbol"
+        rows = await gateway.db_pool.fetch(query)
+        return [row["symbol"] for row in rows]
+    
+    symbols = await cached(SYMBOLS_CACHE_KEY, settings.cache_ttl_symbols, load)
+    return {"symbols": symbols}
 
 
-@app.get("/api/v1/quotes/{symbol}", response_model=QuoteResponse, tags=["Market Data"])
+@app.get("/api/v1/quotes/{symbol}", responses={200: {"model": QuoteResponse}}, tags=["Market Data"])
 async def get_quote(symbol: str):
     """
     Get the latest quote for a specific symbol.
@@ -313,18 +481,21 @@ async def get_quote(symbol: str):
     
     Returns the most recent bid/ask prices and sizes.
     """
-    query = """
-        SELECT timestamp, symbol, bid_price, bid_size, ask_price, ask_size, exchange
-        FROM quotes WHERE symbol = $1 ORDER BY timestamp DESC LIMIT 1
-    """
-    async with gateway.db_pool.acquire() as conn:
-        row = await conn.fetchrow(query, symbol.upper())
+    row = await gateway.db_pool.fetchrow(QUOTE_SQL, symbol.upper())
     if not row:
         raise HTTPException(status_code=404, detail="Symbol not found")
-    return dict(row)
-
-
-@app.get("/api/v1/trades/{symbol}", response_model=TradesResponse, tags=["Market Data"])
+    return ORJSONResponse({
+        "timestamp": row[0],
+        "symbol": row[1],
+        "bid_price": float(row[2]),
+        "bid_size": row[3],
+        "ask_price": float(row[4]),
+        "ask_size": row[5],
+        "exchange": row[6],
+    })
+
+
+@app.get("/api/v1/trades/{symbol}", responses={200: {"model": TradesResponse}}, tags=["Market Data"])
 async def get_trades(
     symbol: str,
     limit: int = Query(default=100, le=1000, description="Maximum number of trades to return")
@@ -337,16 +508,38 @@ async def get_trades(
     
     Returns trades in reverse chronological order.
     """
-    query = """
-        SELECT timestamp, trade_id, symbol, price, quantity, side, exchange
-        FROM trades WHERE symbol = $1 ORDER BY timestamp DESC LIMIT $2
+    rows = await gateway.db_pool.fetch(TRADES_SQL, symbol.upper(), limit)
+    # Rows come straight from the DB, so skip response_model validation and
+    # serialize them with orjson in a single pass
+    return ORJSONResponse({"trades": [trade_row(r) for r in rows]})
+
+
+@app.get("/api/v1/trades/{symbol}/stream", tags=["Market Data"])
+async def stream_trades(
+    symbol: str,
+    limit: int = Query(default=100, le=1000, description="Maximum number of trades to return")
+):
+    """
+    Stream recent trades for a specific symbol as NDJSON.
+    
+    - **symbol**: Stock ticker symbol
+    - **limit**: Maximum number of trades (1-1000)
+    
+    Same rows as `/api/v1/trades/{symbol}`, one JSON object per line. Rows
+    are read from a server-side cursor and written as they arrive, so the
+    full result is never held in memory.
     """
-    async with gateway.db_pool.acquire() as conn:
-        rows = await conn.fetch(query, symbol.upper(), limit)
-    return {"trades": [dict(row) for row in rows]}
+    async def generate() -> AsyncIterator[bytes]:
+        async with gateway.db_pool.acquire() as conn:
+            async with conn.transaction():
+                cursor = await conn.cursor(TRADES_SQL, symbol.upper(), limit)
+                while rows := await cursor.fetch(STREAM_BATCH_SIZE):
+                    yield b"".join(orjson.dumps(trade_row(r)) + b"\n" for r in rows)
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
-@app.get("/api/v1/candles/{symbol}", response_model=CandlesResponse, tags=["Market Data"])
+@app.get("/api/v1/candles/{symbol}", responses={200: {"model": CandlesResponse}}, tags=["Market Data"])
 async def get_candles(
     symbol: str,
     interval: str = Query(default="1m", regex="^(1m|5m|15m|1h|4h|1d)$", description="Candle interval"),
@@ -361,16 +554,25 @@ async def get_candles(
     
     Returns candles with open, high, low, close, volume, and VWAP.
     """
-    query = """
-        SELECT timestamp, symbol, interval, open, high, low, close, volume, trade_count, vwap
-        FROM candles WHERE symbol = $1 AND interval = $2 ORDER BY timestamp DESC LIMIT $3
-    """
-    async with gateway.db_pool.acquire() as conn:
-        rows = await conn.fetch(query, symbol.upper(), interval, limit)
-    return {"candles": [dict(row) for row in rows]}
-
-
-@app.get("/api/v1/alerts", response_model=AlertsResponse, tags=["Alerts"])
+    rows = await gateway.db_pool.fetch(CANDLES_SQL, symbol.upper(), interval, limit)
+    return ORJSONResponse({"candles": [
+        {
+            "timestamp": r[0],
+            "symbol": r[1],
+            "interval": r[2],
+            "open": float(r[3]),
+            "high": float(r[4]),
+            "low": float(r[5]),
+            "close": float(r[6]),
+            "volume": r[7],
+            "trade_count": r[8],
+            "vwap": float(r[9]) if r[9] is not None else None,
+        }
+        for r in rows
+    ]})
+
+
+@app.get("/api/v1/alerts", responses={200: {"model": AlertsResponse}}, tags=["Alerts"])
 async def get_alerts(
     symbol: Optional[str] = Query(default=None, description="Filter by symbol"),
     severity: Optional[str] = Query(default=None, description="Filter by severity (INFO, WARNING, CRITICAL)"),
@@ -385,22 +587,23 @@ async def get_alerts(
     
     Alert types include PRICE_SPIKE, VOLUME_ANOMALY, and PRICE_DROP.
     """
-    query = "SELECT * FROM alerts WHERE 1=1"
-    params = []
-    
-    if symbol:
-        params.append(symbol.upper())
-        query += f" AND symbol = ${len(params)}"
-    if severity:
-        params.append(severity)
-        query += f" AND severity = ${len(params)}"
-    
+    mask = (1 if symbol else 0) | (2 if severity else 0)
+    params = [p for p in (symbol and symbol.upper(), severity) if p]
     params.append(limit)
-    query += f" ORDER BY timestamp DESC LIMIT ${len(params)}"
     
-    async with gateway.db_pool.acquire() as conn:
-        rows = await conn.fetch(query, *params)
-    return {"alerts": [dict(row) for row in rows]}
+    rows = await gateway.db_pool.fetch(ALERTS_SQL[mask], *params)
+    return ORJSONResponse({"alerts": [
+        {
+            "timestamp": r[0],
+            "alert_id": r[1],
+            "symbol": r[2],
+            "alert_type": r[3],
+            "severity": r[4],
+            "message": r[5],
+            "metadata": orjson.loads(r[6]) if r[6] is not None else None,
+        }
+        for r in rows
+    ]})
 
 
 @app.get("/api/v1/market-summary", response_model=MarketSummaryResponse, tags=["Market Data"])
@@ -411,14 +614,19 @@ async def get_market_summary():
     Returns the most recent closing price from 1-minute candles for each symbol.
     Useful for displaying a market overview dashboard.
     """
-    query = """
-        SELECT DISTINCT ON (symbol) symbol, close as price, timestamp
-        FROM candles WHERE interval = '1m'
-        ORDER BY symbol, timestamp DESC
-    """
-    async with gateway.db_pool.acquire() as conn:
-        rows = await conn.fetch(query)
-    return {"summary": [dict(row) for row in rows]}
+    async def load() -> list[dict]:
+        query = """
+            SELECT DISTINCT ON (symbol) symbol, close as price, timestamp
+            FROM candles WHERE interval = '1m'
+            ORDER BY symbol, timestamp DESC
+        """
+        rows = await gateway.db_pool.fetch(query)
+        return [dict(row) for row in rows]
+    
+    summary = await cached(
+        MARKET_SUMMARY_CACHE_KEY, settings.cache_ttl_market_summary, load
+    )
+    return {"summary": summary}
 
 
 # ============================================================================
@@ -431,15 +639,9 @@ async def ws_quotes(websocket: WebSocket, symbol: str):
     WebSocket endpoint for real-time quote updates.
     
     Connect to receive live bid/ask updates for a specific symbol.
-    Messages are JSON-formatted quote objects.
+    Each message is a JSON array of one or more quote objects.
     """
-    channel = f"quotes:{symbol.upper()}"
-    await manager.connect(websocket, channel)
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        manager.disconnect(websocket, channel)
+    await stream_channel(websocket, hubs["quotes"], f"quotes:{symbol.upper()}")
 
 
 @app.websocket("/ws/trades/{symbol}")
@@ -448,15 +650,9 @@ async def ws_trades(websocket: WebSocket, symbol: str):
     WebSocket endpoint for real-time trade feed.
     
     Connect to receive live trade executions for a specific symbol.
-    Messages are JSON-formatted trade objects.
+    Each message is a JSON array of one or more trade objects.
     """
-    channel = f"trades:{symbol.upper()}"
-    await manager.connect(websocket, channel)
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        manager.disconnect(websocket, channel)
+    await stream_channel(websocket, hubs["trades"], f"trades:{symbol.upper()}")
 
 
 @app.websocket("/ws/alerts")
@@ -465,19 +661,43 @@ async def ws_alerts(websocket: WebSocket, symbol: Optional[str] = None):
     WebSocket endpoint for real-time market alerts.
     
     Connect to receive live alerts for price spikes, volume anomalies, etc.
-    Optionally filter by symbol.
+    Optionally filter by symbol. Each message is a JSON array of one or
+    more alert objects.
     """
     channel = f"alerts:{symbol.upper()}" if symbol else "alerts:all"
-    await manager.connect(websocket, channel)
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        manager.disconnect(websocket, channel)
+    await stream_channel(websocket, hubs["alerts"], channel)
+
+
+def worker_count() -> int:
+    """Number of uvicorn worker processes serving the gateway."""
+    return 1 if settings.is_development else settings.api_workers
 
 
 def main():
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8080, log_level="info", reload=settings.is_development)
+    """Run the gateway under uvicorn.
+    
+    Outside development the app runs in ``settings.api_workers`` processes
+    sharing one listening socket. Each worker keeps its own slice of the DB
+    pool and its own Redis hubs, and streams to the WebSocket clients
+    connected to it.
+    """
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8080,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        # Quote and trade frames are a few hundred bytes; compressing them
+        # costs more CPU and latency than the bandwidth it saves
+        ws_per_message_deflate=False,
+        # Detect dead clients with protocol-level pings
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
+        log_level="info",
+        reload=settings.is_development,
+        workers=worker_count(),
+    )
 
 
 if __name__ == "__main__":
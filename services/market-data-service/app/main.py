@@ -7,9 +7,9 @@ Fetches real market data from Yahoo Finance and publishes to Kafka.
 import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime
-from decimal import Decimal
 from typing import AsyncIterator
 import concurrent.futures
+import itertools
 
 import yfinance as yf
 import redis.asyncio as redis
@@ -17,6 +17,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from fastapi.responses import Response
+from pydantic import ValidationError
 
 from finstream_common.config import get_settings
 from finstream_common.logging import setup_logging, get_logger
@@ -27,6 +28,14 @@ settings = get_settings()
 setup_logging(service_name="market-data-service", settings=settings)
 logger = get_logger(__name__)
 
+# Each fetch cycle publishes one burst of trades and flushes it; linger keeps
+# the burst in one batch per partition until the flush
+PRODUCER_LINGER_MS = 50
+PRODUCER_BATCH_SIZE = 64 * 1024
+
+# Symbols fetched from Yahoo in parallel; bounded to stay under rate limits
+FETCH_CONCURRENCY = 8
+
 # Default watchlist
 DEFAULT_SYMBOLS = ["AAPL", "GOOGL", "MSFT", "AMZN", "META", "NVDA", "TSLA", "JPM", "V", "JNJ"]
 
@@ -39,15 +48,26 @@ class YahooFinanceService:
         self.producer: KafkaProducer | None = None
         self.redis_client: redis.Redis | None = None
         self._running = False
-        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=FETCH_CONCURRENCY,
+            thread_name_prefix="yfinance",
+        )
+        self._fetch_semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        self._trade_seq = itertools.count(1)
         self._tasks: list[asyncio.Task] = []
     
     async def start(self):
         """Start the service."""
         logger.info("starting_yahoo_finance_service", symbols=self.symbols)
         
+        # yfinance calls run via asyncio.to_thread on the default executor
+        asyncio.get_running_loop().set_default_executor(self._executor)
+        
         # Initialize Kafka producer
-        self.producer = KafkaProducer()
+        self.producer = KafkaProducer(
+            linger_ms=PRODUCER_LINGER_MS,
+            max_batch_size=PRODUCER_BATCH_SIZE,
+        )
         await self.producer.start()
         
         # Initialize Redis
@@ -79,62 +99,71 @@ class YahooFinanceService:
         self._executor.shutdown(wait=False)
         logger.info("yahoo_finance_service_stopped")
     
-    def _fetch_quotes_sync(self, symbols: list[str]) -> dict:
-        """Synchronous Yahoo Finance fetch (runs in thread pool)."""
+    def _fetch_one(self, symbol: str) -> dict | None:
+        """Synchronous Yahoo Finance fetch for one symbol (runs in thread pool)."""
         try:
-            tickers = yf.Tickers(" ".join(symbols))
-            data = {}
-            for symbol in symbols:
-                try:
-                    ticker = tickers.tickers.get(symbol)
-                    if ticker:
-                        info = ticker.fast_info
-                        data[symbol] = {
-                            "price": float(info.last_price) if hasattr(info, 'last_price') else None,
-                            "open": float(info.open) if hasattr(info, 'open') else None,
-                            "high": float(info.day_high) if hasattr(info, 'day_high') else None,
-                            "low": float(info.day_low) if hasattr(info, 'day_low') else None,
-                            "volume": int(info.last_volume) if hasattr(info, 'last_volume') else 0,
-                            "previous_close": float(info.previous_close) if hasattr(info, 'previous_close') else None,
-                        }
-                except Exception as e:
-                    logger.warning("fetch_symbol_error", symbol=symbol, error=str(e))
-            return data
+            info = yf.Ticker(symbol).fast_info
+            return {
+                "price": float(info.last_price) if hasattr(info, 'last_price') else None,
+                "open": float(info.open) if hasattr(info, 'open') else None,
+                "high": float(info.day_high) if hasattr(info, 'day_high') else None,
+                "low": float(info.day_low) if hasattr(info, 'day_low') else None,
+                "volume": int(info.last_volume) if hasattr(info, 'last_volume') else 0,
+                "previous_close": float(info.previous_close) if hasattr(info, 'previous_close') else None,
+            }
         except Exception as e:
-            logger.error("fetch_quotes_error", error=str(e))
-            return {}
+            logger.warning("fetch_symbol_error", symbol=symbol, error=str(e))
+            return None
+    
+    async def _fetch_symbol(self, symbol: str) -> dict | None:
+        """Fetch one symbol in a worker thread, bounded by the fetch semaphore."""
+        async with self._fetch_semaphore:
+            return await asyncio.to_thread(self._fetch_one, symbol)
+    
+    async def _fetch_quotes(self, symbols: list[str]) -> dict:
+        """Fetch all symbols concurrently."""
+        results = await asyncio.gather(
+            *(self._fetch_symbol(symbol) for symbol in symbols)
+        )
+        return {
+            symbol: data
+            for symbol, data in zip(symbols, results)
+            if data is not None
+        }
     
     async def _fetch_loop(self):
         """Background loop to fetch and publish market data."""
         while self._running:
             try:
                 # Fetch quotes in thread pool (yfinance is sync)
-                loop = asyncio.get_event_loop()
-                quotes = await loop.run_in_executor(
-                    self._executor,
-                    self._fetch_quotes_sync,
-                    self.symbols
-                )
+                quotes = await self._fetch_quotes(list(self.symbols))
                 
-                # Process and publish each quote
+                # Process each quote, queueing all Kafka sends at once
+                sends = []
+                pipe = self.redis_client.pipeline(transaction=False)
+                now = datetime.utcnow()
                 for symbol, data in quotes.items():
                     if data and data.get("price"):
-                        # Create a "trade" from the price update
-                        trade = Trade(
-                            trade_id=f"YF-{symbol}-{datetime.utcnow().timestamp()}",
-                            symbol=symbol,
-                            price=Decimal(str(round(data["price"], 2))),
-                            quantity=data.get("volume", 1000) // 100,  # Scaled volume
-                            side=OrderSide.BUY,
-                            exchange="YAHOO",
-                            timestamp=datetime.utcnow(),
-                        )
-                        
-                        # Publish to Kafka
-                        await self.producer.send_model("trades", trade, key=symbol)
+                        # Create a "trade" from the price update; an invalid
+                        # one (e.g. pre-market volume < 100) is skipped so it
+                        # cannot abort the sends already queued this cycle
+                        try:
+                            trade = Trade(
+                                trade_id=f"YF-{symbol}-{next(self._trade_seq)}",
+                                symbol=symbol,
+                                price=round(data["price"], 2),
+                                quantity=data.get("volume", 1000) // 100,  # Scaled volume
+                                side=OrderSide.BUY,
+                                exchange="YAHOO",
+                                timestamp=now,
+                            )
+                        except ValidationError as e:
+                            logger.warning("invalid_quote_skipped", symbol=symbol, error=str(e))
+                        else:
+                            sends.append(self.producer.send_model("trades", trade, key=symbol))
                         
                         # Cache latest price in Redis
-                        await self.redis_client.setex(
+                        pipe.setex(
                             f"price:{symbol}",
                             60,  # 60 second TTL
                             str(data["price"])
@@ -142,6 +171,11 @@ class YahooFinanceService:
                         
                         logger.debug("published_quote", symbol=symbol, price=data["price"])
                 
+                # Publish to Kafka and write the price cache in one round trip,
+                # then push the burst out without waiting for linger
+                await asyncio.gather(*sends, pipe.execute())
+                await self.producer.flush()
+                
                 # Yahoo Finance has rate limits, fetch every 5 seconds
                 await asyncio.sleep(5)
                 
@@ -153,22 +187,19 @@ class YahooFinanceService:
     
     async def get_quote(self, symbol: str) -> dict | None:
         """Get a single quote."""
-        loop = asyncio.get_event_loop()
-        quotes = await loop.run_in_executor(
-            self._executor,
-            self._fetch_quotes_sync,
-            [symbol]
-        )
-        return quotes.get(symbol)
+        return await self._fetch_symbol(symbol)
     
     async def get_cached_prices(self) -> dict:
         """Get all cached prices from Redis."""
-        prices = {}
-        for symbol in self.symbols:
-            price = await self.redis_client.get(f"price:{symbol}")
-            if price:
-                prices[symbol] = float(price)
-        return prices
+        symbols = list(self.symbols)
+        if not symbols:
+            return {}
+        values = await self.redis_client.mget([f"price:{symbol}" for symbol in symbols])
+        return {
+            symbol: float(price)
+            for symbol, price in zip(symbols, values)
+            if price
+        }
 
 
 service = YahooFinanceService()
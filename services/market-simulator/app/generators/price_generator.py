@@ -17,6 +17,10 @@ from dataclasses import dataclass, field
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict
 
+import numpy as np
+
+from app.generators.price_kernel import step_prices
+
 
 @dataclass
 class SymbolConfig:
@@ -143,6 +147,7 @@ class GBMPriceGenerator:
         self,
         config: SymbolConfig,
         time_step: float = 1.0 / (252 * 6.5 * 60 * 60),  # 1 second in trading year
+        seed: int | None = None,
     ) -> None:
         """
         Initialize the price generator.
@@ -150,9 +155,11 @@ class GBMPriceGenerator:
         Args:
             config: Symbol configuration
             time_step: Time step size (default: 1 second of trading time)
+            seed: Seed for this generator's random stream (random if None)
         """
         self.config = config
         self.time_step = time_step
+        self._random = random.Random(seed)
         
         # Initialize state
         self.state = PriceState(
@@ -176,11 +183,11 @@ class GBMPriceGenerator:
         base_size = self.config.level_depth
         
         self.state.bid_sizes = [
-            random.randint(int(base_size * 0.5), int(base_size * 1.5))
+            self._random.randint(int(base_size * 0.5), int(base_size * 1.5))
             for _ in range(self.config.bid_levels)
         ]
         self.state.ask_sizes = [
-            random.randint(int(base_size * 0.5), int(base_size * 1.5))
+            self._random.randint(int(base_size * 0.5), int(base_size * 1.5))
             for _ in range(self.config.ask_levels)
         ]
     
@@ -199,7 +206,7 @@ class GBMPriceGenerator:
         volatility = self._current_volatility * math.sqrt(self.time_step)
         
         # Wiener process increment
-        dW = random.gauss(0, 1)
+        dW = self._random.gauss(0, 1)
         
         # GBM formula: S(t+dt) = S(t) * exp((μ - σ²/2)dt + σdW)
         exponent = (drift - 0.5 * volatility ** 2) + volatility * dW
@@ -230,7 +237,7 @@ class GBMPriceGenerator:
     def _update_volatility(self) -> None:
         """Update volatility with mean reversion (Ornstein-Uhlenbeck process)."""
         # Mean-reverting volatility
-        vol_innovation = random.gauss(0, 0.001)
+        vol_innovation = self._random.gauss(0, 0.001)
         self._current_volatility = (
             self._current_volatility
             + self._volatility_reversion_speed * (self._volatility_mean - self._current_volatility)
@@ -248,7 +255,7 @@ class GBMPriceGenerator:
         vol_spread = price * self._current_volatility * 0.0001
         
         # Add random component
-        random_spread = random.uniform(0, self.config.tick_size)
+        random_spread = self._random.uniform(0, self.config.tick_size)
         
         total_spread = base_spread + vol_spread + random_spread
         half_spread = total_spread / 2
@@ -265,11 +272,11 @@ class GBMPriceGenerator:
     def _update_order_book(self) -> None:
         """Update order book sizes with random changes."""
         for i in range(len(self.state.bid_sizes)):
-            change = random.randint(-100, 100)
+            change = self._random.randint(-100, 100)
             self.state.bid_sizes[i] = max(100, self.state.bid_sizes[i] + change)
         
         for i in range(len(self.state.ask_sizes)):
-            change = random.randint(-100, 100)
+            change = self._random.randint(-100, 100)
             self.state.ask_sizes[i] = max(100, self.state.ask_sizes[i] + change)
     
     def _round_to_tick(self, price: float) -> float:
@@ -305,51 +312,130 @@ class GBMPriceGenerator:
 
 class MarketSimulator:
     """
-    Manages multiple price generators for a simulated market.
+    Simulates a market of symbols with vectorized GBM.
+    
+    Uses the same model as GBMPriceGenerator, but per-symbol state is kept
+    in NumPy arrays indexed by position in ``symbols`` so one step advances
+    every symbol in a handful of array operations. Prices are held as int64
+    cents; PriceState snapshots (in dollars) are only built when requested.
     """
     
-    def __init__(self, symbols: list[str] | None = None) -> None:
+    def __init__(
+        self,
+        symbols: list[str] | None = None,
+        time_step: float = 1.0 / (252 * 6.5 * 60 * 60),  # 1 second in trading year
+        seed: int | None = None,
+    ) -> None:
         """
         Initialize market simulator.
         
         Args:
             symbols: List of symbols to simulate (uses defaults if None)
+            time_step: Time step size (default: 1 second of trading time)
+            seed: Seed for the simulator's random stream (random if None)
         """
-        self.generators: Dict[str, GBMPriceGenerator] = {}
-        
-        # Initialize generators for requested symbols
         if symbols:
-            for symbol in symbols:
-                config = DEFAULT_SYMBOLS.get(
+            configs = [
+                DEFAULT_SYMBOLS.get(
                     symbol,
                     SymbolConfig(symbol=symbol, initial_price=100.0, volatility=0.25)
                 )
-                self.generators[symbol] = GBMPriceGenerator(config)
+                for symbol in symbols
+            ]
         else:
             # Use all default symbols
-            for symbol, config in DEFAULT_SYMBOLS.items():
-                self.generators[symbol] = GBMPriceGenerator(config)
+            configs = list(DEFAULT_SYMBOLS.values())
+        
+        self.configs = configs
+        self.symbols = [config.symbol for config in configs]
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.time_step = time_step
+        self._rng = np.random.default_rng(seed)
+        
+        # Static parameters (ticks below one cent are not representable)
+        self.tick_cents = np.array(
+            [max(1, round(c.tick_size * 100)) for c in configs], dtype=np.int64
+        )
+        self.drifts = np.array([c.drift for c in configs], dtype=np.float64)
+        self.vol_means = np.array([c.volatility for c in configs], dtype=np.float64)
+        self._volatility_reversion_speed = 0.1
+        
+        # Price state, in cents
+        self.price_cents = np.array(
+            [round(c.initial_price * 100) for c in configs], dtype=np.int64
+        )
+        self.vols = self.vol_means.copy()
+        self.bid_cents = self.price_cents - self.tick_cents
+        self.ask_cents = self.price_cents + self.tick_cents
+        
+        # Statistics
+        self.high_cents = self.price_cents.copy()
+        self.low_cents = self.price_cents.copy()
+        self.volumes = np.zeros(len(configs), dtype=np.int64)
+        self.trade_counts = np.zeros(len(configs), dtype=np.int64)
+        
+        # Order book sizes, shape (2, symbols, levels) with bids then asks;
+        # symbols with fewer levels than the deepest book only expose their
+        # own levels in get_state
+        self.bid_levels = np.array([c.bid_levels for c in configs], dtype=np.int64)
+        self.ask_levels = np.array([c.ask_levels for c in configs], dtype=np.int64)
+        levels = max(1, int(self.bid_levels.max()), int(self.ask_levels.max()))
+        depths = np.array([c.level_depth for c in configs], dtype=np.int64)[:, None]
+        self._book = self._rng.integers(
+            depths // 2, depths * 3 // 2,
+            size=(2, len(configs), levels),
+            endpoint=True,
+        )
+        self.bid_sizes = self._book[0]
+        self.ask_sizes = self._book[1]
     
-    def step_all(self) -> Dict[str, PriceState]:
-        """
-        Advance all price generators by one step.
+    def step_all(self) -> None:
+        """Advance every symbol by one step."""
+        n = len(self.symbols)
+        rng = self._rng
         
-        Returns:
-            Dict mapping symbol to updated PriceState
-        """
-        return {
-            symbol: generator.step()
-            for symbol, generator in self.generators.items()
-        }
+        step_prices(
+            self.price_cents,
+            self.vols,
+            self.vol_means,
+            self.drifts,
+            self.tick_cents,
+            self.high_cents,
+            self.low_cents,
+            self.bid_cents,
+            self.ask_cents,
+            self._book,
+            rng.standard_normal(2 * n),
+            rng.random(n),
+            rng.integers(-100, 100, size=self._book.shape, endpoint=True),
+            self.time_step,
+            self._volatility_reversion_speed,
+            0.001,
+            100,
+        )
     
     def get_state(self, symbol: str) -> PriceState | None:
-        """Get current state for a symbol."""
-        generator = self.generators.get(symbol)
-        if generator:
-            return generator.state
-        return None
+        """Get a snapshot of the current state for a symbol."""
+        i = self.index.get(symbol)
+        if i is None:
+            return None
+        return PriceState(
+            symbol=symbol,
+            price=int(self.price_cents[i]) / 100,
+            bid_price=int(self.bid_cents[i]) / 100,
+            ask_price=int(self.ask_cents[i]) / 100,
+            spread=int(self.ask_cents[i] - self.bid_cents[i]) / 100,
+            bid_sizes=self.bid_sizes[i, :self.bid_levels[i]].tolist(),
+            ask_sizes=self.ask_sizes[i, :self.ask_levels[i]].tolist(),
+            high=int(self.high_cents[i]) / 100,
+            low=int(self.low_cents[i]) / 100,
+            volume=int(self.volumes[i]),
+            trade_count=int(self.trade_counts[i]),
+        )
     
     def reset_daily_stats(self) -> None:
         """Reset daily stats for all symbols."""
-        for generator in self.generators.values():
-            generator.reset_daily_stats()
+        self.high_cents[:] = self.price_cents
+        self.low_cents[:] = self.price_cents
+        self.volumes[:] = 0
+        self.trade_counts[:] = 0
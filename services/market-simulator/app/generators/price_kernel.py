@@ -0,0 +1,92 @@
+"""
+Numba kernel for the market simulator step.
+
+Fuses the volatility, price, spread and order book updates for every
+symbol into one compiled loop, so a step costs a single pass over the state
+arrays instead of a chain of NumPy temporaries.
+"""
+
+import math
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def step_prices(
+    price_cents: np.ndarray,
+    vols: np.ndarray,
+    vol_means: np.ndarray,
+    drifts: np.ndarray,
+    tick_cents: np.ndarray,
+    high_cents: np.ndarray,
+    low_cents: np.ndarray,
+    bid_cents: np.ndarray,
+    ask_cents: np.ndarray,
+    book: np.ndarray,
+    normals: np.ndarray,
+    spread_u: np.ndarray,
+    book_changes: np.ndarray,
+    dt: float,
+    reversion_speed: float,
+    vol_of_vol: float,
+    min_level_size: int,
+) -> None:
+    """
+    Advance every symbol by one GBM step, updating the state arrays in place.
+    
+    Prices are int64 cents, so snapping to the tick grid is integer
+    arithmetic and prices never drift off it. Randomness is drawn by the
+    caller and passed in: ``normals`` holds 2N standard normals (the
+    volatility innovations, then the Wiener increments), ``spread_u`` a
+    U(0, 1) draw per symbol for the random spread and ``book_changes`` the
+    size change for every level of ``book`` (shape (2, N, levels): bids,
+    then asks).
+    """
+    n = price_cents.shape[0]
+    sqrt_dt = math.sqrt(dt)
+    for i in range(n):
+        tick = tick_cents[i]
+        
+        # Mean-reverting volatility (Ornstein-Uhlenbeck), bounded
+        vol = vols[i] + reversion_speed * (vol_means[i] - vols[i]) + vol_of_vol * normals[i]
+        vol = min(1.0, max(0.05, vol))
+        vols[i] = vol
+        
+        # GBM formula: S(t+dt) = S(t) * exp((μ - σ²/2)dt + σdW)
+        sigma = vol * sqrt_dt
+        growth = math.exp(drifts[i] * dt - 0.5 * sigma * sigma + sigma * normals[n + i])
+        price = np.int64(np.rint(price_cents[i] * growth / tick)) * tick
+        price = max(price, tick)
+        price_cents[i] = price
+        high_cents[i] = max(high_cents[i], price)
+        low_cents[i] = min(low_cents[i], price)
+        
+        # Spread: base + volatility component + random component
+        half_spread = (2.0 * tick + price * vol * 0.0001 + spread_u[i] * tick) / 2.0
+        bid = np.int64(np.rint((price - half_spread) / tick)) * tick
+        ask = np.int64(np.rint((price + half_spread) / tick)) * tick
+        bid_cents[i] = bid
+        # Ensure spread is at least one tick
+        ask_cents[i] = max(ask, bid + tick)
+        
+        # Random walk on order book level sizes, floored
+        for side in range(2):
+            for level in range(book.shape[2]):
+                book[side, i, level] = max(
+                    min_level_size, book[side, i, level] + book_changes[side, i, level]
+                )
+
+
+def warm_up() -> None:
+    """Compile (or load from cache) the kernel before the first step."""
+    one = np.ones(1, dtype=np.float64)
+    cents = np.full(1, 100, dtype=np.int64)
+    book = np.full((2, 1, 1), 100, dtype=np.int64)
+    step_prices(
+        cents.copy(), one.copy(), one.copy(), one.copy(),
+        np.ones(1, dtype=np.int64), cents.copy(), cents.copy(),
+        cents.copy(), cents.copy(), book,
+        np.ones(2), one.copy(), np.zeros_like(book),
+        1e-6, 0.1, 0.001, 100,
+    )
@@ -2,14 +2,13 @@
 Trade and Quote generator that produces events from price states.
 """
 
-import random
 from datetime import datetime
-from decimal import Decimal
 from typing import Iterator
 
+import numpy as np
 from finstream_common.models import Trade, Quote, OrderSide
 
-from app.generators.price_generator import MarketSimulator, PriceState, DEFAULT_SYMBOLS
+from app.generators.price_generator import MarketSimulator, DEFAULT_SYMBOLS
 
 
 class TradeGenerator:
@@ -27,6 +26,7 @@ class TradeGenerator:
         self,
         market: MarketSimulator,
         trades_per_second: float = 50.0,  # Average trades per second total
+        seed: int | None = None,
     ) -> None:
         """
         Initialize trade generator.
@@ -34,18 +34,22 @@ class TradeGenerator:
         Args:
             market: MarketSimulator instance for price data
             trades_per_second: Target number of trades per second
+            seed: Seed for the generator's random stream (random if None)
         """
         self.market = market
         self.trades_per_second = trades_per_second
+        self._rng = np.random.default_rng(seed)
         
         # Trade size distribution parameters (power law)
         self._size_alpha = 1.5  # Shape parameter
         self._min_size = 1
         self._max_size = 10000
+        self._pareto_k = (self._min_size / self._max_size) ** self._size_alpha
+        self._neg_inv_alpha = -1.0 / self._size_alpha
         
         # Buy/sell pressure (0.5 = neutral)
         self._buy_pressure: dict[str, float] = {
-            symbol: 0.5 for symbol in market.generators.keys()
+            symbol: 0.5 for symbol in market.symbols
         }
         
         # Volume multipliers per symbol (some stocks trade more)
@@ -61,79 +65,19 @@ class TradeGenerator:
             "V": 0.7,
             "JNJ": 0.5,
         }
-    
-    def generate_trade(self, symbol: str, state: PriceState) -> Trade:
-        """
-        Generate a single trade for a symbol.
-        
-        Args:
-            symbol: Trading symbol
-            state: Current price state
-            
-        Returns:
-            Trade event
-        """
-        # Determine side based on buy pressure
-        buy_pressure = self._buy_pressure.get(symbol, 0.5)
-        side = OrderSide.BUY if random.random() < buy_pressure else OrderSide.SELL
-        
-        # Generate trade size (power law distribution)
-        quantity = self._generate_trade_size()
-        
-        # Price is at bid for sells, ask for buys, with some variance
-        if side == OrderSide.BUY:
-            base_price = state.ask_price
-        else:
-            base_price = state.bid_price
-        
-        # Add small random variance
-        price_variance = random.gauss(0, state.spread * 0.1)
-        price = base_price + price_variance
-        price = max(0.01, price)  # Ensure positive
         
-        # Update state
-        state.volume += quantity
-        state.trade_count += 1
-        
-        # Update buy pressure (mean reverting)
-        self._update_buy_pressure(symbol, side)
-        
-        # Get exchange from config
-        config = DEFAULT_SYMBOLS.get(symbol)
-        exchange = config.exchange if config else "NASDAQ"
-        
-        return Trade(
-            symbol=symbol,
-            price=Decimal(str(round(price, 2))),
-            quantity=quantity,
-            side=side,
-            exchange=exchange,
-            timestamp=datetime.utcnow(),
+        # Weights aligned with market.symbols (fixed for the simulator's lifetime)
+        self._weights = np.array(
+            [self._volume_weights.get(s, 1.0) for s in market.symbols],
+            dtype=np.float64,
         )
-    
-    def generate_quote(self, symbol: str, state: PriceState) -> Quote:
-        """
-        Generate a quote for a symbol.
+        self._total_weight = float(self._weights.sum())
         
-        Args:
-            symbol: Trading symbol
-            state: Current price state
-            
-        Returns:
-            Quote event
-        """
-        config = DEFAULT_SYMBOLS.get(symbol)
-        exchange = config.exchange if config else "NASDAQ"
-        
-        return Quote(
-            symbol=symbol,
-            bid_price=Decimal(str(round(state.bid_price, 2))),
-            bid_size=state.bid_sizes[0] if state.bid_sizes else 100,
-            ask_price=Decimal(str(round(state.ask_price, 2))),
-            ask_size=state.ask_sizes[0] if state.ask_sizes else 100,
-            exchange=exchange,
-            timestamp=datetime.utcnow(),
-        )
+        # Exchange per symbol index
+        self._exchanges = [
+            DEFAULT_SYMBOLS[s].exchange if s in DEFAULT_SYMBOLS else "NASDAQ"
+            for s in market.symbols
+        ]
     
     def generate_batch(
         self,
@@ -142,34 +86,97 @@ class TradeGenerator:
         """
         Generate a batch of trades and quotes.
         
+        Prices are stepped once, then each symbol's quote and trades are
+        built in a single pass over the simulator's per-symbol arrays.
+        
         Args:
             batch_size: Number of trades to generate
             
         Returns:
             Tuple of (trades list, quotes list)
         """
-        trades: list[Trade] = []
-        quotes: list[Quote] = []
+        market = self.market
         
         # Step all prices forward
-        states = self.market.step_all()
+        market.step_all()
+        symbols = market.symbols
+        now = datetime.utcnow()
         
-        # Generate quotes for all symbols
-        for symbol, state in states.items():
-            quotes.append(self.generate_quote(symbol, state))
+        bid_cents = market.bid_cents.tolist()
+        ask_cents = market.ask_cents.tolist()
+        bid_top = np.where(market.bid_levels > 0, market.bid_sizes[:, 0], 100).tolist()
+        ask_top = np.where(market.ask_levels > 0, market.ask_sizes[:, 0], 100).tolist()
         
         # Distribute trades across symbols based on volume weights
-        total_weight = sum(
-            self._volume_weights.get(s, 1.0) for s in states.keys()
+        counts_arr = np.maximum(
+            1, (batch_size / self._total_weight * self._weights).astype(np.int64)
         )
+        counts = counts_arr.tolist()
+        
+        # Draw all randomness for the batch up front
+        total_trades = int(counts_arr.sum())
+        rng = self._rng
+        side_u = rng.random(total_trades).tolist()
+        variance_z = rng.standard_normal(total_trades).tolist()
+        sizes = self._generate_trade_sizes(total_trades)
+        walk_z = rng.standard_normal(total_trades).tolist()
         
-        for symbol, state in states.items():
-            weight = self._volume_weights.get(symbol, 1.0)
-            symbol_trades = int(batch_size * weight / total_weight) or 1
+        trades: list[Trade] = []
+        quotes: list[Quote] = []
+        volumes = [0] * len(symbols)
+        exchanges = self._exchanges
+        
+        offset = 0
+        for i, symbol in enumerate(symbols):
+            exchange = exchanges[i]
+            bid = bid_cents[i] / 100
+            ask = ask_cents[i] / 100
             
-            for _ in range(symbol_trades):
-                trade = self.generate_trade(symbol, state)
-                trades.append(trade)
+            quotes.append(Quote(
+                symbol=symbol,
+                bid_price=bid,
+                bid_size=bid_top[i],
+                ask_price=ask,
+                ask_size=ask_top[i],
+                exchange=exchange,
+                timestamp=now,
+            ))
+            
+            # Trade price variance scales with the spread (10% of it, in dollars)
+            noise = (ask_cents[i] - bid_cents[i]) * 0.001
+            buy_pressure = self._buy_pressure.get(symbol, 0.5)
+            volume = 0
+            
+            for k in range(offset, offset + counts[i]):
+                # Buys fill at the ask, sells at the bid
+                if side_u[k] < buy_pressure:
+                    side = OrderSide.BUY
+                    price = ask + variance_z[k] * noise
+                else:
+                    side = OrderSide.SELL
+                    price = bid + variance_z[k] * noise
+                
+                quantity = sizes[k]
+                volume += quantity
+                
+                trades.append(Trade(
+                    symbol=symbol,
+                    price=round(max(0.01, price), 2),
+                    quantity=quantity,
+                    side=side,
+                    exchange=exchange,
+                    timestamp=now,
+                ))
+                
+                buy_pressure = self._next_buy_pressure(buy_pressure, side, walk_z[k])
+            
+            self._buy_pressure[symbol] = buy_pressure
+            volumes[i] = volume
+            offset += counts[i]
+        
+        # Update state
+        market.volumes += volumes
+        market.trade_counts += counts_arr
         
         return trades, quotes
     
@@ -197,48 +204,54 @@ class TradeGenerator:
             for quote in quotes:
                 yield quote
     
-    def _generate_trade_size(self) -> int:
+    def _generate_trade_sizes(self, n: int) -> list[int]:
         """
-        Generate trade size using power law distribution.
+        Generate trade sizes using power law distribution.
         
+        Args:
+            n: Number of trade sizes to draw
+            
         Returns:
-            Trade size in shares
+            Trade sizes in shares
         """
         # Power law: P(x) ~ x^(-alpha)
-        # Using inverse transform sampling
-        u = random.random()
-        
-        # Pareto distribution
-        x_min = self._min_size
-        x_max = self._max_size
-        alpha = self._size_alpha
-        
-        # Bounded Pareto
-        size = x_min * (1 - u + u * (x_min / x_max) ** alpha) ** (-1 / alpha)
+        # Using inverse transform sampling on a bounded Pareto
+        u = self._rng.random(n)
+        size = self._min_size * np.power(
+            1 - u + u * self._pareto_k, self._neg_inv_alpha
+        )
         
         # Round to lot size (typically 100 shares, but allow odd lots)
-        if size > 100:
-            size = round(size / 100) * 100
-        else:
-            size = max(1, round(size))
+        size = np.where(
+            size > 100,
+            np.round(size / 100) * 100,
+            np.maximum(1, np.round(size)),
+        )
         
-        return int(min(size, x_max))
+        return np.minimum(size, self._max_size).astype(np.int64).tolist()
     
-    def _update_buy_pressure(self, symbol: str, last_side: OrderSide) -> None:
+    @staticmethod
+    def _next_buy_pressure(
+        current: float,
+        last_side: OrderSide,
+        walk_z: float,
+    ) -> float:
         """
-        Update buy pressure with mean reversion.
+        Advance buy pressure with mean reversion.
         
         Args:
-            symbol: Trading symbol
+            current: Current buy pressure
             last_side: Side of last trade
+            walk_z: Standard normal draw for the random walk step
+            
+        Returns:
+            New buy pressure
         """
-        current = self._buy_pressure.get(symbol, 0.5)
-        
         # Mean reversion toward 0.5
         reversion = 0.01 * (0.5 - current)
         
         # Small random walk
-        random_walk = random.gauss(0, 0.02)
+        random_walk = walk_z * 0.02
         
         # Momentum from last trade
         momentum = 0.01 if last_side == OrderSide.BUY else -0.01
@@ -246,4 +259,4 @@ class TradeGenerator:
         new_pressure = current + reversion + random_walk + momentum
         
         # Bound between 0.3 and 0.7
-        self._buy_pressure[symbol] = max(0.3, min(0.7, new_pressure))
+        return max(0.3, min(0.7, new_pressure))
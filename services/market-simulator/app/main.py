@@ -6,13 +6,14 @@ Generates realistic financial market data and publishes to Kafka.
 
 import asyncio
 import signal
+from collections import defaultdict
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import AsyncIterator
 
 import uvicorn
 from fastapi import FastAPI, Response
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
 
 from finstream_common.config import get_settings
 from finstream_common.kafka import KafkaProducer
@@ -21,7 +22,9 @@ from finstream_common.metrics import setup_metrics, get_metrics
 from finstream_common.tracing import setup_tracing
 
 from app.generators.price_generator import MarketSimulator
+from app.generators.price_kernel import warm_up as warm_up_kernels
 from app.generators.trade_generator import TradeGenerator
+from app.pacing import TokenBucket
 
 # Initialize
 settings = get_settings()
@@ -30,6 +33,13 @@ setup_tracing(service_name="market-simulator", settings=settings)
 metrics = setup_metrics(service_name="market-simulator", settings=settings)
 logger = get_logger(__name__)
 
+# Each batch is queued in one burst; linger long enough to ship it as a
+# single produce request per partition
+PRODUCER_LINGER_MS = 50
+
+# Upper bound on trades generated per cycle (also the burst after a stall)
+MAX_TRADES_PER_BATCH = 500
+
 
 class SimulatorService:
     """
@@ -39,21 +49,39 @@ class SimulatorService:
     def __init__(self) -> None:
         self.producer: KafkaProducer | None = None
         self.market = MarketSimulator()
-        self.trade_generator = TradeGenerator(self.market)
+        self.trade_generator = TradeGenerator(
+            self.market, trades_per_second=settings.trades_per_second
+        )
         self._running = False
         self._tasks: list[asyncio.Task] = []
         
+        # Message keys pre-encoded once instead of on every send
+        self._symbol_keys: dict[str, bytes] = {
+            symbol: symbol.encode("utf-8") for symbol in self.market.symbols
+        }
+        
+        # Labelled metric children per (symbol, side)
+        self._trade_counters: dict[tuple[str, str], tuple[Counter, Counter, Counter]] = {}
+        
+        # UTC timestamp for probe responses, refreshed once per second
+        self.now_iso = datetime.utcnow().isoformat()
+        
+        # Per-symbol /status payload, rebuilt once per second
+        self.price_snapshot = self._build_price_snapshot()
+        
         # Configuration
-        self.batch_interval = 0.1  # 100ms between batches
-        self.trades_per_batch = 50
-        self.quotes_per_batch = 10  # Quotes for all symbols
+        self.trades_per_second = settings.trades_per_second
+        self.quote_interval = 0.2  # Seconds between quote snapshots
     
     async def start(self) -> None:
         """Start the simulator service."""
         logger.info("starting_market_simulator")
         
+        # Compile the step kernel before the first batch
+        warm_up_kernels()
+        
         # Initialize Kafka producer
-        self.producer = KafkaProducer()
+        self.producer = KafkaProducer(linger_ms=PRODUCER_LINGER_MS)
         await self.producer.start()
         
         self._running = True
@@ -63,12 +91,13 @@ class SimulatorService:
             asyncio.create_task(self._trade_producer_loop()),
             asyncio.create_task(self._quote_producer_loop()),
             asyncio.create_task(self._stats_reporter_loop()),
+            asyncio.create_task(self._ticker_loop()),
         ]
         
         logger.info(
             "market_simulator_started",
-            symbols=list(self.market.generators.keys()),
-            batch_interval=self.batch_interval,
+            symbols=self.market.symbols,
+            trades_per_second=self.trades_per_second,
         )
     
     async def stop(self) -> None:
@@ -90,48 +119,65 @@ class SimulatorService:
         
         logger.info("market_simulator_stopped")
     
+    def _cache_trade_counters(self, key: tuple[str, str]) -> tuple[Counter, Counter, Counter]:
+        """Resolve and cache the trade metric children for a (symbol, side) pair."""
+        symbol, side = key
+        counters = (
+            metrics.trades_produced.labels(symbol=symbol, side=side),
+            metrics.trade_value.labels(symbol=symbol, side=side),
+            metrics.trade_volume.labels(symbol=symbol, side=side),
+        )
+        self._trade_counters[key] = counters
+        return counters
+    
     async def _trade_producer_loop(self) -> None:
         """Background loop that generates and publishes trades."""
         logger.info("trade_producer_loop_started")
         
+        bucket = TokenBucket(self.trades_per_second, MAX_TRADES_PER_BATCH)
+        # Every symbol trades at least once per batch
+        min_batch = len(self.market.symbols)
+        
         while self._running:
             try:
-                # Generate batch of trades
+                # Size the batch from the trades accrued since the last one
+                available = await bucket.wait(min_batch)
                 trades, _ = self.trade_generator.generate_batch(
-                    batch_size=self.trades_per_batch
+                    batch_size=min(available, MAX_TRADES_PER_BATCH)
                 )
+                bucket.consume(len(trades))
                 
-                # Publish to Kafka
-                for trade in trades:
-                    await self.producer.send(
+                # Publish to Kafka, queueing the whole batch at once
+                await asyncio.gather(*(
+                    self.producer.send(
                         topic=settings.topic_trades,
                         value=trade.to_json(),
-                        key=trade.symbol,
+                        key=self._symbol_keys[trade.symbol],
                     )
-                    
-                    # Update metrics
-                    metrics.trades_produced.labels(
-                        symbol=trade.symbol,
-                        side=trade.side.value,
-                    ).inc()
-                    
-                    metrics.trade_value.labels(
-                        symbol=trade.symbol,
-                        side=trade.side.value,
-                    ).inc(float(trade.notional))
-                    
-                    metrics.trade_volume.labels(
-                        symbol=trade.symbol,
-                        side=trade.side.value,
-                    ).inc(trade.quantity)
+                    for trade in trades
+                ))
+                
+                # Update metrics once per (symbol, side) for the whole batch
+                totals: dict[tuple[str, str], list] = defaultdict(lambda: [0, 0.0, 0])
+                for trade in trades:
+                    agg = totals[(trade.symbol, trade.side.value)]
+                    agg[0] += 1
+                    agg[1] += float(trade.price) * trade.quantity
+                    agg[2] += trade.quantity
+                
+                for key, (count, notional, quantity) in totals.items():
+                    counters = self._trade_counters.get(key)
+                    if counters is None:
+                        counters = self._cache_trade_counters(key)
+                    produced, value, volume = counters
+                    produced.inc(count)
+                    value.inc(notional)
+                    volume.inc(quantity)
                 
                 metrics.kafka_messages_sent.labels(
                     topic=settings.topic_trades
                 ).inc(len(trades))
                 
-                # Throttle
-                await asyncio.sleep(self.batch_interval)
-                
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -146,40 +192,73 @@ class SimulatorService:
         """Background loop that generates and publishes quotes."""
         logger.info("quote_producer_loop_started")
         
+        # One snapshot per interval, clocked independently of send latency
+        bucket = TokenBucket(1 / self.quote_interval, 1)
+        
         while self._running:
             try:
+                await bucket.wait(1)
+                bucket.consume(1)
+                
                 # Generate quotes for all symbols
                 _, quotes = self.trade_generator.generate_batch(batch_size=1)
                 
-                # Publish to Kafka
-                for quote in quotes:
-                    await self.producer.send(
+                # Publish to Kafka, queueing the whole batch at once
+                await asyncio.gather(*(
+                    self.producer.send(
                         topic=settings.topic_quotes,
                         value=quote.to_json(),
-                        key=quote.symbol,
+                        key=self._symbol_keys[quote.symbol],
                     )
+                    for quote in quotes
+                ))
                 
                 metrics.kafka_messages_sent.labels(
                     topic=settings.topic_quotes
                 ).inc(len(quotes))
                 
-                # Quotes update less frequently than trades
-                await asyncio.sleep(self.batch_interval * 2)
-                
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.exception("quote_producer_error", error=str(e))
                 await asyncio.sleep(1)
     
+    async def _ticker_loop(self) -> None:
+        """Refresh per-second state served by the HTTP endpoints."""
+        while self._running:
+            try:
+                await asyncio.sleep(1)
+                self.now_iso = datetime.utcnow().isoformat()
+                self.price_snapshot = self._build_price_snapshot()
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.exception("ticker_error", error=str(e))
+    
+    def _build_price_snapshot(self) -> dict[str, dict]:
+        """Format the current per-symbol prices and stats for /status."""
+        return {
+            state.symbol: {
+                "price": round(state.price, 2),
+                "bid": round(state.bid_price, 2),
+                "ask": round(state.ask_price, 2),
+                "high": round(state.high, 2),
+                "low": round(state.low, 2),
+                "volume": state.volume,
+                "trades": state.trade_count,
+            }
+            for state in map(self.market.get_state, self.market.symbols)
+        }
+    
     async def _stats_reporter_loop(self) -> None:
         """Periodically log statistics."""
         while self._running:
             try:
                 await asyncio.sleep(60)  # Report every minute
                 
-                for symbol, generator in self.market.generators.items():
-                    state = generator.state
+                for symbol in self.market.symbols:
+                    state = self.market.get_state(symbol)
                     logger.info(
                         "symbol_stats",
                         symbol=symbol,
@@ -225,7 +304,7 @@ async def health_check() -> dict:
     return {
         "status": "healthy",
         "service": "market-simulator",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": simulator_service.now_iso,
         "running": simulator_service._running,
     }
 
@@ -239,7 +318,7 @@ async def readiness_check() -> dict:
     )
     return {
         "status": "ready" if is_ready else "not_ready",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": simulator_service.now_iso,
     }
 
 
@@ -257,19 +336,8 @@ async def status() -> dict:
     """Get current simulator status."""
     return {
         "running": simulator_service._running,
-        "symbols": list(simulator_service.market.generators.keys()),
-        "prices": {
-            symbol: {
-                "price": round(gen.state.price, 2),
-                "bid": round(gen.state.bid_price, 2),
-                "ask": round(gen.state.ask_price, 2),
-                "high": round(gen.state.high, 2),
-                "low": round(gen.state.low, 2),
-                "volume": gen.state.volume,
-                "trades": gen.state.trade_count,
-            }
-            for symbol, gen in simulator_service.market.generators.items()
-        },
+        "symbols": simulator_service.market.symbols,
+        "prices": simulator_service.price_snapshot,
     }
 
 
@@ -0,0 +1,77 @@
+"""
+Rate pacing for the producer loops.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket that paces a producer to a target event rate.
+
+    Tokens accrue continuously at ``rate`` per second up to ``capacity``.
+    Callers wait for enough tokens to cover a minimal batch, size the batch
+    from what has accrued, then consume what they actually produced. The
+    rate target is therefore independent of the batch shape: a slow cycle
+    simply yields a larger next batch.
+
+    Usage:
+        bucket = TokenBucket(rate=100.0, capacity=500)
+        while True:
+            available = await bucket.wait(10)
+            events = produce(min(available, 500))
+            bucket.consume(len(events))
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (bounds the burst after a stall)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Accrue tokens for the time elapsed since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def wait(self, minimum: float = 1) -> int:
+        """
+        Wait until at least ``minimum`` tokens are available.
+
+        Only sleeps when the bucket is short; otherwise it still yields to
+        the event loop once so a busy producer cannot starve other tasks.
+
+        Args:
+            minimum: Tokens required before returning
+
+        Returns:
+            Whole tokens currently available
+        """
+        self._refill()
+        shortfall = minimum - self._tokens
+        await asyncio.sleep(shortfall / self.rate if shortfall > 0 else 0)
+        self._refill()
+        return int(self._tokens)
+
+    def consume(self, amount: float) -> None:
+        """
+        Remove tokens for events that were produced.
+
+        The balance may go negative when a batch overshoots; the debt is
+        repaid before the next ``wait`` returns.
+
+        Args:
+            amount: Tokens to remove
+        """
+        self._tokens -= amount
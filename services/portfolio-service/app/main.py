@@ -4,7 +4,10 @@ Portfolio Service - User Authentication, Portfolios, and Trading
 Production-ready portfolio management with JWT authentication.
 """
 
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -13,11 +16,14 @@ from uuid import UUID
 
 import asyncpg
 import httpx
+import jwt
+import redis.asyncio as redis
 import structlog
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
 from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr, Field
 from pydantic_settings import BaseSettings
@@ -42,7 +48,7 @@ class Settings(BaseSettings):
 
 settings = Settings()
 logger = structlog.get_logger()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 security = HTTPBearer()
 
 
@@ -70,7 +76,7 @@ class TokenResponse(BaseModel):
 
 
 class UserResponse(BaseModel):
-    id: str
+    id: UUID
     email: str
     username: str
     full_name: str | None
@@ -86,7 +92,7 @@ class PortfolioCreate(BaseModel):
 
 
 class PortfolioResponse(BaseModel):
-    id: str
+    id: UUID
     name: str
     description: str | None
     initial_cash: Decimal
@@ -114,7 +120,7 @@ class TradeRequest(BaseModel):
 
 
 class TradeResponse(BaseModel):
-    transaction_id: str
+    transaction_id: UUID
     symbol: str
     transaction_type: str
     quantity: Decimal
@@ -125,7 +131,7 @@ class TradeResponse(BaseModel):
 
 
 class TransactionResponse(BaseModel):
-    id: str
+    id: UUID
     symbol: str
     transaction_type: str
     quantity: Decimal
@@ -135,7 +141,7 @@ class TransactionResponse(BaseModel):
 
 
 class PortfolioSummary(BaseModel):
-    portfolio_id: str
+    portfolio_id: UUID
     name: str
     cash_balance: Decimal
     holdings_value: Decimal
@@ -164,6 +170,14 @@ async def get_db() -> asyncpg.Pool:
 # JWT AUTHENTICATION
 # =============================================================================
 
+# Authenticated users keyed by access token; a hit skips both the signature
+# check and the users lookup. Entries never outlive the token itself.
+AUTH_CACHE_TTL_SECONDS = 30
+_auth_cache: TTLCache[str, tuple[dict, float]] = TTLCache(
+    maxsize=10_000, ttl=AUTH_CACHE_TTL_SECONDS
+)
+
+
 def create_access_token(user_id: str) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     payload = {"sub": user_id, "exp": expire, "type": "access"}
@@ -181,6 +195,10 @@ async def get_current_user(
     db: asyncpg.Pool = Depends(get_db)
 ) -> dict:
     token = credentials.credentials
+    cached = _auth_cache.get(token)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
         user_id = payload.get("sub")
@@ -189,7 +207,7 @@ async def get_current_user(
         if user_id is None or token_type != "access":
             raise HTTPException(status_code=401, detail="Invalid token")
             
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
     
     user = await db.fetchrow(
@@ -200,38 +218,105 @@ async def get_current_user(
     if user is None or not user["is_active"]:
         raise HTTPException(status_code=401, detail="User not found or inactive")
     
-    return dict(user)
+    current_user = dict(user)
+    _auth_cache[token] = (current_user, payload["exp"])
+    return current_user
 
 
 # =============================================================================
 # MARKET DATA CLIENT
 # =============================================================================
 
-async def get_current_price(symbol: str) -> Decimal | None:
+# Prices fetched from market-data-service are shared across requests briefly
+PRICE_CACHE_TTL_MS = 1000
+
+http_client: httpx.AsyncClient | None = None
+redis_client: redis.Redis | None = None
+
+# Price fetches in flight, shared by concurrent cache misses on a symbol
+_price_fetches: dict[str, asyncio.Task] = {}
+
+
+async def fetch_price(symbol: str) -> Decimal | None:
     """Get current price from market-data-service."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.market_data_url}/api/v1/yahoo/quote/{symbol}",
-                timeout=5.0
-            )
-            if response.status_code == 200:
-                data = response.json()
-                return Decimal(str(data.get("price", 0)))
+        response = await http_client.get(f"/api/v1/yahoo/quote/{symbol}")
+        if response.status_code == 200:
+            data = response.json()
+            return Decimal(str(data.get("price", 0)))
     except Exception as e:
         logger.warning("failed_to_get_price", symbol=symbol, error=str(e))
     return None
 
 
+async def fetch_price_shared(symbol: str) -> Decimal | None:
+    """Fetch a price, joining a fetch already in flight for the symbol."""
+    task = _price_fetches.get(symbol)
+    if task is None:
+        task = asyncio.create_task(fetch_price(symbol))
+        _price_fetches[symbol] = task
+        task.add_done_callback(lambda _: _price_fetches.pop(symbol, None))
+    # A cancelled caller must not cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+async def get_current_prices(symbols: list[str]) -> dict[str, Decimal | None]:
+    """
+    Get current prices for several symbols.
+    
+    Prices fetched within the last PRICE_CACHE_TTL_MS are served from Redis
+    with one MGET; the rest are fetched concurrently and cached. Concurrent
+    misses on the same symbol share a single upstream request.
+    """
+    keys = [f"px:{symbol}" for symbol in symbols]
+    try:
+        cached = await redis_client.mget(keys)
+    except Exception as e:
+        logger.warning("price_cache_read_failed", error=str(e))
+        cached = [None] * len(symbols)
+    
+    prices: dict[str, Decimal | None] = {
+        symbol: Decimal(value)
+        for symbol, value in zip(symbols, cached)
+        if value is not None
+    }
+    misses = [symbol for symbol in dict.fromkeys(symbols) if symbol not in prices]
+    if not misses:
+        return prices
+    
+    fetched = await asyncio.gather(*(fetch_price_shared(symbol) for symbol in misses))
+    pipe = redis_client.pipeline(transaction=False)
+    for symbol, price in zip(misses, fetched):
+        prices[symbol] = price
+        if price is not None:
+            pipe.set(f"px:{symbol}", str(price), px=PRICE_CACHE_TTL_MS)
+    try:
+        await pipe.execute()
+    except Exception as e:
+        logger.warning("price_cache_write_failed", error=str(e))
+    return prices
+
+
+async def get_current_price(symbol: str) -> Decimal | None:
+    """Get current price for one symbol, through the price cache."""
+    prices = await get_current_prices([symbol])
+    return prices[symbol]
+
+
 # =============================================================================
 # APPLICATION LIFECYCLE
 # =============================================================================
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    global pool
+    global pool, http_client, redis_client
     logger.info("starting_portfolio_service")
     
+    # bcrypt is CPU-bound and runs via asyncio.to_thread; one worker per core
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+    )
+    
     # Connect to database
     pool = await asyncpg.create_pool(
         settings.database_url,
@@ -240,8 +325,18 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     )
     logger.info("database_connected")
     
+    # Keep-alive client for market-data-service price lookups
+    http_client = httpx.AsyncClient(
+        base_url=settings.market_data_url,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
+    redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+    
     yield
     
+    await http_client.aclose()
+    await redis_client.close()
     if pool:
         await pool.close()
     logger.info("portfolio_service_stopped")
@@ -273,6 +368,7 @@ All portfolio and trading endpoints require JWT authentication.
     """,
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {"name": "Health", "description": "Service health endpoints"},
         {"name": "Authentication", "description": "User registration and login"},
@@ -321,37 +417,31 @@ async def register(user_data: UserCreate, db: asyncpg.Pool = Depends(get_db)):
     Creates a new user with the provided email, username, and password.
     A default portfolio with $10,000 virtual cash is automatically created.
     """
-    # Check if email or username exists
-    existing = await db.fetchrow(
-        "SELECT email FROM users WHERE email = $1 OR username = $2",
-        user_data.email, user_data.username
-    )
-    if existing:
-        raise HTTPException(status_code=400, detail="Email or username already registered")
-    
     # Hash password and create user
-    password_hash = pwd_context.hash(user_data.password)
+    password_hash = await asyncio.to_thread(pwd_context.hash, user_data.password)
     
+    # Create the user and its default portfolio in one statement; the unique
+    # email/username constraints turn a duplicate into no row at all
     user = await db.fetchrow(
         """
-        INSERT INTO users (email, username, password_hash, full_name)
-        VALUES ($1, $2, $3, $4)
-        RETURNING id, email, username, full_name, is_verified, created_at
+        WITH new_user AS (
+            INSERT INTO users (email, username, password_hash, full_name)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT DO NOTHING
+            RETURNING id, email, username, full_name, is_verified, created_at
+        ), default_portfolio AS (
+            INSERT INTO portfolios (user_id, name, is_default)
+            SELECT id, 'My Portfolio', TRUE FROM new_user
+        )
+        SELECT * FROM new_user
         """,
         user_data.email, user_data.username, password_hash, user_data.full_name
     )
-    
-    # Create default portfolio
-    await db.execute(
-        """
-        INSERT INTO portfolios (user_id, name, is_default)
-        VALUES ($1, 'My Portfolio', TRUE)
-        """,
-        user["id"]
-    )
+    if user is None:
+        raise HTTPException(status_code=400, detail="Email or username already registered")
     
     logger.info("user_registered", user_id=str(user["id"]), email=user_data.email)
-    return UserResponse(id=str(user["id"]), **{k: v for k, v in dict(user).items() if k != "id"})
+    return UserResponse(**dict(user))
 
 
 @app.post("/api/v1/auth/login", response_model=TokenResponse, tags=["Authentication"])
@@ -367,7 +457,9 @@ async def login(credentials: UserLogin, db: asyncpg.Pool = Depends(get_db)):
         credentials.email
     )
     
-    if user is None or not pwd_context.verify(credentials.password, user["password_hash"]):
+    if user is None or not await asyncio.to_thread(
+        pwd_context.verify, credentials.password, user["password_hash"]
+    ):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     if not user["is_active"]:
@@ -399,7 +491,7 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     Requires valid JWT access token in Authorization header.
     """
     return UserResponse(
-        id=str(current_user["id"]),
+        id=current_user["id"],
         email=current_user["email"],
         username=current_user["username"],
         full_name=current_user["full_name"],
@@ -429,7 +521,7 @@ async def list_portfolios(
         """,
         current_user["id"]
     )
-    return [PortfolioResponse(id=str(r["id"]), **{k: v for k, v in dict(r).items() if k != "id"}) for r in rows]
+    return [PortfolioResponse(**dict(r)) for r in rows]
 
 
 @app.post("/api/v1/portfolios", response_model=PortfolioResponse, status_code=201, tags=["Portfolios"])
@@ -453,12 +545,12 @@ async def create_portfolio(
         """,
         current_user["id"], data.name, data.description, data.initial_cash, data.is_public
     )
-    return PortfolioResponse(id=str(row["id"]), **{k: v for k, v in dict(row).items() if k != "id"})
+    return PortfolioResponse(**dict(row))
 
 
 @app.get("/api/v1/portfolios/{portfolio_id}/summary", response_model=PortfolioSummary, tags=["Portfolios"])
 async def get_portfolio_summary(
-    portfolio_id: str,
+    portfolio_id: UUID,
     current_user: dict = Depends(get_current_user),
     db: asyncpg.Pool = Depends(get_db)
 ):
@@ -471,58 +563,70 @@ async def get_portfolio_summary(
     - Unrealized P&L per holding and total
     - Portfolio total value
     """
-    # Verify ownership
+    # Verify ownership and collect the held symbols in one round trip
     portfolio = await db.fetchrow(
-        "SELECT * FROM portfolios WHERE id = $1 AND user_id = $2",
-        UUID(portfolio_id), current_user["id"]
+        """
+        SELECT p.name, p.current_cash,
+               ARRAY(
+                   SELECT h.symbol FROM holdings h
+                   WHERE h.portfolio_id = p.id AND h.quantity > 0
+               ) AS symbols
+        FROM portfolios p WHERE p.id = $1 AND p.user_id = $2
+        """,
+        portfolio_id, current_user["id"]
     )
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
     
-    # Get holdings
-    holdings = await db.fetch(
-        """
-        SELECT symbol, quantity, average_cost, total_cost
-        FROM holdings WHERE portfolio_id = $1 AND quantity > 0
-        """,
-        UUID(portfolio_id)
-    )
+    # Fetch current prices for all holdings at once
+    symbols = portfolio["symbols"]
+    prices = await get_current_prices(symbols)
+    
+    # Value the holdings in the database; holdings without a price are
+    # carried at cost
+    rows = []
+    if symbols:
+        rows = await db.fetch(
+            """
+            WITH px AS (
+                SELECT * FROM unnest($2::text[], $3::numeric[]) AS t(symbol, price)
+            ), valued AS (
+                SELECT h.symbol, h.quantity, h.average_cost, h.total_cost,
+                       px.price AS current_price,
+                       COALESCE(h.quantity * px.price, h.total_cost) AS market_value
+                FROM holdings h LEFT JOIN px USING (symbol)
+                WHERE h.portfolio_id = $1 AND h.quantity > 0
+            )
+            SELECT symbol, quantity, average_cost, total_cost, current_price, market_value,
+                   market_value - total_cost AS unrealized_pnl,
+                   CASE WHEN current_price IS NOT NULL AND total_cost > 0
+                        THEN (market_value - total_cost) / total_cost * 100
+                        ELSE 0
+                   END AS unrealized_pnl_pct,
+                   SUM(market_value) OVER () AS holdings_value,
+                   SUM(total_cost) OVER () AS cost_basis
+            FROM valued
+            """,
+            portfolio_id, symbols, [prices[symbol] or None for symbol in symbols]
+        )
     
-    # Enrich with current prices
-    enriched_holdings = []
-    total_market_value = Decimal("0")
-    total_cost_basis = Decimal("0")
+    enriched_holdings = [
+        HoldingResponse(
+            symbol=r["symbol"],
+            quantity=r["quantity"],
+            average_cost=r["average_cost"],
+            total_cost=r["total_cost"],
+            current_price=r["current_price"],
+            market_value=r["market_value"],
+            unrealized_pnl=r["unrealized_pnl"],
+            unrealized_pnl_pct=r["unrealized_pnl_pct"]
+        )
+        for r in rows
+    ]
+    total_market_value = rows[0]["holdings_value"] if rows else Decimal("0")
+    total_cost_basis = rows[0]["cost_basis"] if rows else Decimal("0")
     
-    for h in holdings:
-        current_price = await get_current_price(h["symbol"])
-        quantity = Decimal(str(h["quantity"]))
-        avg_cost = Decimal(str(h["average_cost"]))
-        total_cost = Decimal(str(h["total_cost"]))
-        
-        if current_price:
-            market_value = quantity * current_price
-            pnl = market_value - total_cost
-            pnl_pct = (pnl / total_cost * 100) if total_cost > 0 else Decimal("0")
-        else:
-            market_value = total_cost
-            pnl = Decimal("0")
-            pnl_pct = Decimal("0")
-        
-        total_market_value += market_value
-        total_cost_basis += total_cost
-        
-        enriched_holdings.append(HoldingResponse(
-            symbol=h["symbol"],
-            quantity=quantity,
-            average_cost=avg_cost,
-            total_cost=total_cost,
-            current_price=current_price,
-            market_value=market_value,
-            unrealized_pnl=pnl,
-            unrealized_pnl_pct=pnl_pct
-        ))
-    
-    cash = Decimal(str(portfolio["current_cash"]))
+    cash = portfolio["current_cash"]
     total_value = cash + total_market_value
     total_pnl = total_market_value - total_cost_basis
     total_pnl_pct = (total_pnl / total_cost_basis * 100) if total_cost_basis > 0 else Decimal("0")
@@ -546,7 +650,7 @@ async def get_portfolio_summary(
 
 @app.post("/api/v1/portfolios/{portfolio_id}/buy", response_model=TradeResponse, tags=["Trading"])
 async def buy_stock(
-    portfolio_id: str,
+    portfolio_id: UUID,
     trade: TradeRequest,
     current_user: dict = Depends(get_current_user),
     db: asyncpg.Pool = Depends(get_db)
@@ -564,7 +668,7 @@ async def buy_stock(
     # Verify ownership
     portfolio = await db.fetchrow(
         "SELECT id FROM portfolios WHERE id = $1 AND user_id = $2",
-        UUID(portfolio_id), current_user["id"]
+        portfolio_id, current_user["id"]
     )
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
@@ -578,19 +682,19 @@ async def buy_stock(
     try:
         result = await db.fetchrow(
             "SELECT * FROM execute_buy($1, $2, $3, $4, $5)",
-            UUID(portfolio_id), trade.symbol.upper(), trade.quantity, price, trade.notes
+            portfolio_id, trade.symbol.upper(), trade.quantity, price, trade.notes
         )
     except asyncpg.exceptions.RaiseError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
     logger.info("buy_executed", 
-                portfolio_id=portfolio_id, 
+                portfolio_id=str(portfolio_id), 
                 symbol=trade.symbol.upper(),
                 quantity=str(trade.quantity),
                 price=str(price))
     
     return TradeResponse(
-        transaction_id=str(result["transaction_id"]),
+        transaction_id=result["transaction_id"],
         symbol=trade.symbol.upper(),
         transaction_type="BUY",
         quantity=trade.quantity,
@@ -603,7 +707,7 @@ async def buy_stock(
 
 @app.post("/api/v1/portfolios/{portfolio_id}/sell", response_model=TradeResponse, tags=["Trading"])
 async def sell_stock(
-    portfolio_id: str,
+    portfolio_id: UUID,
     trade: TradeRequest,
     current_user: dict = Depends(get_current_user),
     db: asyncpg.Pool = Depends(get_db)
@@ -621,7 +725,7 @@ async def sell_stock(
     # Verify ownership
     portfolio = await db.fetchrow(
         "SELECT id FROM portfolios WHERE id = $1 AND user_id = $2",
-        UUID(portfolio_id), current_user["id"]
+        portfolio_id, current_user["id"]
     )
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
@@ -635,20 +739,20 @@ async def sell_stock(
     try:
         result = await db.fetchrow(
             "SELECT * FROM execute_sell($1, $2, $3, $4, $5)",
-            UUID(portfolio_id), trade.symbol.upper(), trade.quantity, price, trade.notes
+            portfolio_id, trade.symbol.upper(), trade.quantity, price, trade.notes
         )
     except asyncpg.exceptions.RaiseError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
     logger.info("sell_executed",
-                portfolio_id=portfolio_id,
+                portfolio_id=str(portfolio_id),
                 symbol=trade.symbol.upper(),
                 quantity=str(trade.quantity),
                 price=str(price),
                 realized_pnl=str(result["realized_pnl"]))
     
     return TradeResponse(
-        transaction_id=str(result["transaction_id"]),
+        transaction_id=result["transaction_id"],
         symbol=trade.symbol.upper(),
         transaction_type="SELL",
         quantity=trade.quantity,
@@ -661,7 +765,7 @@ async def sell_stock(
 
 @app.get("/api/v1/portfolios/{portfolio_id}/transactions", response_model=list[TransactionResponse], tags=["Portfolios"])
 async def get_transactions(
-    portfolio_id: str,
+    portfolio_id: UUID,
     limit: int = 50,
     current_user: dict = Depends(get_current_user),
     db: asyncpg.Pool = Depends(get_db)
@@ -674,7 +778,7 @@ async def get_transactions(
     # Verify ownership
     portfolio = await db.fetchrow(
         "SELECT id FROM portfolios WHERE id = $1 AND user_id = $2",
-        UUID(portfolio_id), current_user["id"]
+        portfolio_id, current_user["id"]
     )
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
@@ -685,10 +789,10 @@ async def get_transactions(
         FROM transactions WHERE portfolio_id = $1
         ORDER BY executed_at DESC LIMIT $2
         """,
-        UUID(portfolio_id), limit
+        portfolio_id, limit
     )
     
-    return [TransactionResponse(id=str(r["id"]), **{k: v for k, v in dict(r).items() if k != "id"}) for r in rows]
+    return [TransactionResponse(**dict(r)) for r in rows]
 
 
 # =============================================================================
@@ -4,15 +4,20 @@ OHLCV Candle Aggregator
 Computes Open-High-Low-Close-Volume candles from trade stream.
 """
 
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from finstream_common.models import Trade, Candle
 from finstream_common.logging import get_logger
 from finstream_common.metrics import get_metrics
 
+from app.candle_kernel import reduce_ohlcv
+
 logger = get_logger(__name__)
 metrics = get_metrics()
 
@@ -27,61 +32,147 @@ INTERVAL_SECONDS = {
     "1d": 86400,
 }
 
+# Prices carry at most 8 decimal places, so they are held as exact int64
+# fixed-point values in units of 1e-8
+PRICE_SCALE = 10**8
+
+# Trades a builder holds before its arrays double
+INITIAL_CAPACITY = 64
+
+# Symbols with open candles kept before the least recently traded is evicted
+DEFAULT_MAX_SYMBOLS = 10_000
+
+
+# Trade timestamps are naive UTC; bucket math runs on whole epoch seconds
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+
+def _epoch_seconds(timestamp: datetime) -> int:
+    """Whole seconds since the epoch for a naive UTC timestamp."""
+    return (timestamp - EPOCH) // ONE_SECOND
+
+
+def _from_fixed(value: int, places: int = 8) -> Decimal:
+    """
+    Convert a fixed-point price back to a Decimal with ``places`` decimal
+    places (exact for any trade price quoted to at most ``places``).
+    """
+    return Decimal(int(value) // 10 ** (8 - places)).scaleb(-places)
+
 
 @dataclass
 class CandleBuilder:
     """
     Builds a single candle from trades.
+    
+    Trades are appended to preallocated int64 arrays (fixed-point prices
+    and quantities); OHLCV is reduced over them by a compiled kernel when
+    the candle is read.
     """
     
     symbol: str
     interval: str
-    bucket_start: datetime
+    bucket_epoch: int
+    
+    # Continues a bucket whose earlier trades were flushed early, so its
+    # candle is merged into the stored row rather than replacing it
+    merge: bool = False
     
-    open: Decimal | None = None
-    high: Decimal | None = None
-    low: Decimal | None = None
-    close: Decimal | None = None
-    volume: int = 0
     trade_count: int = 0
-    value_sum: Decimal = field(default_factory=lambda: Decimal("0"))
+    # Most decimal places among the trade prices, so OHLC keep the
+    # precision the prices were quoted with
+    price_places: int = 0
+    prices: np.ndarray = field(
+        default_factory=lambda: np.empty(INITIAL_CAPACITY, dtype=np.int64)
+    )
+    quantities: np.ndarray = field(
+        default_factory=lambda: np.empty(INITIAL_CAPACITY, dtype=np.int64)
+    )
     
     def add_trade(self, trade: Trade) -> None:
         """Add a trade to this candle."""
-        price = trade.price
-        
-        if self.open is None:
-            self.open = price
+        n = self.trade_count
+        if n == len(self.prices):
+            self._grow()
         
-        if self.high is None or price > self.high:
-            self.high = price
-        
-        if self.low is None or price < self.low:
-            self.low = price
-        
-        self.close = price
-        self.volume += trade.quantity
-        self.trade_count += 1
-        self.value_sum += price * trade.quantity
+        self.prices[n] = int(trade.price * PRICE_SCALE)
+        places = -trade.price.as_tuple().exponent
+        if places > self.price_places:
+            self.price_places = places
+        self.quantities[n] = trade.quantity
+        self.trade_count = n + 1
+    
+    def _grow(self) -> None:
+        """Double the capacity of the trade arrays."""
+        n = len(self.prices)
+        prices = np.empty(2 * n, dtype=np.int64)
+        prices[:n] = self.prices
+        quantities = np.empty(2 * n, dtype=np.int64)
+        quantities[:n] = self.quantities
+        self.prices = prices
+        self.quantities = quantities
+    
+    @property
+    def bucket_start(self) -> datetime:
+        """Start of the candle's time bucket."""
+        return EPOCH + timedelta(seconds=self.bucket_epoch)
+    
+    @property
+    def open(self) -> Decimal | None:
+        """Price of the first trade."""
+        if self.is_empty:
+            return None
+        return _from_fixed(self.prices[0], self.price_places)
+    
+    @property
+    def high(self) -> Decimal | None:
+        """Highest trade price."""
+        if self.is_empty:
+            return None
+        return _from_fixed(self.prices[:self.trade_count].max(), self.price_places)
+    
+    @property
+    def low(self) -> Decimal | None:
+        """Lowest trade price."""
+        if self.is_empty:
+            return None
+        return _from_fixed(self.prices[:self.trade_count].min(), self.price_places)
+    
+    @property
+    def close(self) -> Decimal | None:
+        """Price of the latest trade."""
+        if self.is_empty:
+            return None
+        return _from_fixed(self.prices[self.trade_count - 1], self.price_places)
+    
+    @property
+    def volume(self) -> int:
+        """Total traded quantity."""
+        return int(self.quantities[:self.trade_count].sum())
     
     def to_candle(self) -> Candle | None:
         """Convert builder to Candle model."""
-        if self.open is None or self.close is None:
+        n = self.trade_count
+        if n == 0:
             return None
         
-        # Calculate VWAP (round to 8 decimal places to match Pydantic model)
-        vwap = self.value_sum / self.volume if self.volume > 0 else self.close
-        vwap = round(vwap, 8)
+        open_, high, low, close, volume, value_sum = reduce_ohlcv(
+            self.prices, self.quantities, n
+        )
+        
+        # VWAP in fixed point, rounded to the model's 8 decimal places
+        vwap = _from_fixed(round(value_sum / volume) if volume > 0 else close)
         
         return Candle(
             symbol=self.symbol,
             interval=self.interval,
-            open=self.open,
-            high=self.high or self.open,
-            low=self.low or self.open,
-            close=self.close,
-            volume=self.volume,
-            trade_count=self.trade_count,
+            open=_from_fixed(open_, self.price_places),
+            high=_from_fixed(high, self.price_places),
+            low=_from_fixed(low, self.price_places),
+            close=_from_fixed(close, self.price_places),
+            volume=int(volume),
+            trade_count=n,
             vwap=vwap,
             timestamp=self.bucket_start,
         )
@@ -107,6 +198,7 @@ class CandleAggregator:
         self,
         repository: "TradeRepository",
         intervals: list[str] | None = None,
+        max_symbols: int = DEFAULT_MAX_SYMBOLS,
     ) -> None:
         """
         Initialize aggregator.
@@ -114,96 +206,141 @@ class CandleAggregator:
         Args:
             repository: Database repository for persistence
             intervals: List of candle intervals (e.g., ["1m", "5m"])
+            max_symbols: Symbols with open candles kept; beyond this the
+                least recently traded symbol's candles are flushed early
         """
         self.repository = repository
         self.intervals = intervals or ["1m", "5m"]
-        
-        # Current candles being built: {interval: {symbol: CandleBuilder}}
-        self._builders: Dict[str, Dict[str, CandleBuilder]] = {
-            interval: {} for interval in self.intervals
-        }
+        self.max_symbols = max_symbols
         
         # Validate intervals
         for interval in self.intervals:
             if interval not in INTERVAL_SECONDS:
                 raise ValueError(f"Unknown interval: {interval}")
+        
+        # (interval, bucket length in seconds), in aggregation order
+        self._interval_seconds = [
+            (interval, INTERVAL_SECONDS[interval]) for interval in self.intervals
+        ]
+        
+        # Current candles being built, least recently traded symbol first:
+        # {symbol: [CandleBuilder or None, one slot per interval]}
+        self._builders: OrderedDict[str, list[CandleBuilder | None]] = OrderedDict()
+        
+        # Open buckets already partly written by an eviction:
+        # {(symbol, interval, bucket_epoch)}
+        self._flushed_early: set[tuple[str, str, int]] = set()
     
-    def _get_bucket_start(self, timestamp: datetime, interval: str) -> datetime:
+    @staticmethod
+    def _bucket_epoch(epoch: int, seconds: int) -> int:
         """
-        Get the start of the time bucket for a timestamp.
+        Get the start of the time bucket for an epoch timestamp.
         
         Args:
-            timestamp: Trade timestamp
-            interval: Candle interval
+            epoch: Timestamp in whole epoch seconds
+            seconds: Bucket length in seconds
             
         Returns:
-            Start of the bucket
+            Start of the bucket in epoch seconds
         """
-        seconds = INTERVAL_SECONDS[interval]
-        
-        # Truncate to bucket
-        epoch = timestamp.timestamp()
-        bucket_epoch = (int(epoch) // seconds) * seconds
-        
-        return datetime.utcfromtimestamp(bucket_epoch)
+        return epoch - epoch % seconds
     
-    async def add_trade(self, trade: Trade) -> None:
+    def add_trade(self, trade: Trade) -> list[CandleBuilder]:
         """
         Add a trade to all interval aggregations.
         
+        Candles whose bucket the trade rolls over are returned rather than
+        flushed, so callers can persist them in one batch.
+        
         Args:
             trade: Trade to add
-        """
-        for interval in self.intervals:
-            bucket_start = self._get_bucket_start(trade.timestamp, interval)
             
-            # Get or create builder
-            if trade.symbol not in self._builders[interval]:
-                self._builders[interval][trade.symbol] = CandleBuilder(
-                    symbol=trade.symbol,
-                    interval=interval,
-                    bucket_start=bucket_start,
-                )
+        Returns:
+            Builders completed by this trade (usually empty)
+        """
+        completed: list[CandleBuilder] = []
+        symbol = trade.symbol
+        epoch = _epoch_seconds(trade.timestamp)
+        
+        # One lookup per trade finds the builders for every interval
+        builders = self._builders
+        slots = builders.get(symbol)
+        if slots is None:
+            # Make room by handing back the least recently traded symbol
+            if len(builders) >= self.max_symbols:
+                _, evicted = builders.popitem(last=False)
+                for builder in evicted:
+                    if builder is not None:
+                        self._flushed_early.add(
+                            (builder.symbol, builder.interval, builder.bucket_epoch)
+                        )
+                        completed.append(builder)
             
-            builder = self._builders[interval][trade.symbol]
+            slots = [None] * len(self._interval_seconds)
+            builders[symbol] = slots
+        else:
+            builders.move_to_end(symbol)
+        
+        for i, (interval, seconds) in enumerate(self._interval_seconds):
+            bucket_epoch = self._bucket_epoch(epoch, seconds)
+            builder = slots[i]
             
             # Check if we need a new candle
-            if builder.bucket_start != bucket_start:
-                # Flush the old candle
-                await self._flush_builder(builder)
+            if builder is None or builder.bucket_epoch != bucket_epoch:
+                # Hand back the old candle for flushing
+                if builder is not None:
+                    completed.append(builder)
                 
                 # Create new builder
                 builder = CandleBuilder(
-                    symbol=trade.symbol,
+                    symbol=symbol,
                     interval=interval,
-                    bucket_start=bucket_start,
+                    bucket_epoch=bucket_epoch,
+                    merge=(symbol, interval, bucket_epoch) in self._flushed_early,
                 )
-                self._builders[interval][trade.symbol] = builder
+                slots[i] = builder
             
             # Add trade to builder
             builder.add_trade(trade)
+        
+        return completed
     
-    async def _flush_builder(self, builder: CandleBuilder) -> bool:
+    async def flush_builders(self, builders: list[CandleBuilder]) -> int:
         """
-        Flush a candle builder to the database.
+        Flush candle builders to the database in one batch.
+        
+        Builders continuing an early-flushed bucket are merged into the
+        stored rows after the others are written; all others overwrite.
         
         Args:
-            builder: CandleBuilder to flush
+            builders: CandleBuilders to flush
             
         Returns:
-            True if candle was flushed
+            Number of candles flushed
         """
-        if builder.is_empty:
-            return False
-        
-        candle = builder.to_candle()
-        if candle is None:
-            return False
+        candles: list[Candle] = []
+        merged: list[Candle] = []
+        for builder in builders:
+            if not builder.is_empty and (candle := builder.to_candle()) is not None:
+                (merged if builder.merge else candles).append(candle)
+        if not candles and not merged:
+            return 0
         
         try:
-            await self.repository.insert_candle(candle)
-            
-            # Update metrics
+            await self.repository.insert_candles(candles)
+            await self.repository.insert_candles(merged, merge=True)
+        except Exception as e:
+            logger.exception(
+                "candle_flush_error",
+                candles=len(candles) + len(merged),
+                error=str(e),
+            )
+            return 0
+        
+        candles += merged
+        
+        # Update metrics
+        for candle in candles:
             metrics.candles_produced.labels(
                 symbol=candle.symbol,
                 interval=candle.interval,
@@ -222,17 +359,8 @@ class CandleAggregator:
                 close=str(candle.close),
                 volume=candle.volume,
             )
-            
-            return True
-            
-        except Exception as e:
-            logger.exception(
-                "candle_flush_error",
-                symbol=builder.symbol,
-                interval=builder.interval,
-                error=str(e),
-            )
-            return False
+        
+        return len(candles)
     
     async def flush_completed(self) -> int:
         """
@@ -241,28 +369,35 @@ class CandleAggregator:
         Returns:
             Number of candles flushed
         """
-        now = datetime.utcnow()
-        flushed = 0
+        now = _epoch_seconds(datetime.utcnow())
+        to_flush: list[CandleBuilder] = []
         
-        for interval in self.intervals:
-            seconds = INTERVAL_SECONDS[interval]
-            
-            for symbol, builder in list(self._builders[interval].items()):
-                bucket_end = builder.bucket_start + timedelta(seconds=seconds)
+        idle: list[str] = []
+        
+        for symbol, slots in self._builders.items():
+            for i, (_, seconds) in enumerate(self._interval_seconds):
+                builder = slots[i]
                 
-                if now >= bucket_end:
-                    if await self._flush_builder(builder):
-                        flushed += 1
-                    
-                    # Create new empty builder for next period
-                    new_bucket = self._get_bucket_start(now, interval)
-                    self._builders[interval][symbol] = CandleBuilder(
-                        symbol=symbol,
-                        interval=interval,
-                        bucket_start=new_bucket,
-                    )
-        
-        return flushed
+                # The next trade for the symbol opens its new builder
+                if builder is not None and now >= builder.bucket_epoch + seconds:
+                    to_flush.append(builder)
+                    slots[i] = None
+            
+            if all(builder is None for builder in slots):
+                idle.append(symbol)
+        
+        # Drop symbols with no open candles in a separate pass
+        for symbol in idle:
+            del self._builders[symbol]
+        
+        # Closed buckets can no longer be continued
+        self._flushed_early = {
+            key
+            for key in self._flushed_early
+            if now < key[2] + INTERVAL_SECONDS[key[1]]
+        }
+        
+        return await self.flush_builders(to_flush)
     
     async def flush_all(self) -> int:
         """
@@ -271,16 +406,15 @@ class CandleAggregator:
         Returns:
             Number of candles flushed
         """
-        flushed = 0
+        to_flush: list[CandleBuilder] = []
         
-        for interval in self.intervals:
-            for builder in self._builders[interval].values():
-                if await self._flush_builder(builder):
-                    flushed += 1
-            
-            self._builders[interval] = {}
+        for slots in self._builders.values():
+            to_flush.extend(builder for builder in slots if builder is not None)
+        
+        self._builders = OrderedDict()
+        self._flushed_early = set()
         
-        return flushed
+        return await self.flush_builders(to_flush)
     
     def get_current_candles(self) -> Dict[str, Dict[str, dict]]:
         """
@@ -289,13 +423,12 @@ class CandleAggregator:
         Returns:
             Dict of interval -> symbol -> candle data
         """
-        result = {}
+        result: Dict[str, Dict[str, dict]] = {interval: {} for interval in self.intervals}
         
-        for interval, builders in self._builders.items():
-            result[interval] = {}
-            for symbol, builder in builders.items():
-                if not builder.is_empty:
-                    result[interval][symbol] = {
+        for symbol, slots in self._builders.items():
+            for builder in slots:
+                if builder is not None and not builder.is_empty:
+                    result[builder.interval][symbol] = {
                         "open": str(builder.open),
                         "high": str(builder.high),
                         "low": str(builder.low),
@@ -0,0 +1,45 @@
+"""
+Numba kernel for candle reductions.
+
+Reduces a builder's fixed-point price and quantity arrays to OHLCV in a
+single compiled pass instead of separate NumPy max/min/sum/dot passes.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def reduce_ohlcv(
+    prices: np.ndarray,
+    quantities: np.ndarray,
+    n: int,
+) -> tuple[int, int, int, int, int, float]:
+    """
+    Reduce the first ``n`` trades to open, high, low, close, volume and the
+    sum of price * quantity.
+
+    Prices are int64 fixed point; the value sum is accumulated in float64 so
+    large candles cannot overflow.
+    """
+    first = prices[0]
+    high = first
+    low = first
+    volume = 0
+    value_sum = 0.0
+    for i in range(n):
+        price = prices[i]
+        quantity = quantities[i]
+        if price > high:
+            high = price
+        if price < low:
+            low = price
+        volume += quantity
+        value_sum += float(price) * quantity
+    return first, high, low, prices[n - 1], volume, value_sum
+
+
+def warm_up() -> None:
+    """Compile (or load from cache) the kernel before the first flush."""
+    one = np.ones(1, dtype=np.int64)
+    reduce_ohlcv(one, one, 1)
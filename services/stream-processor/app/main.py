@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import AsyncIterator
 
 import uvicorn
+import redis.asyncio as redis
 from fastapi import FastAPI, Response
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
@@ -20,7 +21,8 @@ from finstream_common.metrics import setup_metrics, get_metrics
 from finstream_common.tracing import setup_tracing
 from finstream_common.models import Trade
 
-from app.aggregator import CandleAggregator
+from app.aggregator import CandleAggregator, CandleBuilder
+from app.candle_kernel import warm_up as warm_up_kernels
 from app.repository import TradeRepository
 
 # Initialize
@@ -30,6 +32,14 @@ setup_tracing(service_name="stream-processor", settings=settings)
 metrics = setup_metrics(service_name="stream-processor", settings=settings)
 logger = get_logger(__name__)
 
+# Cached symbol list served by the API gateway
+SYMBOLS_CACHE_KEY = "cache:symbols:v1"
+
+# Trades fetched per consumer wakeup; each fetch is inserted and committed
+# as one batch
+CONSUMER_MAX_RECORDS = 1000
+CONSUMER_POLL_TIMEOUT_MS = 100
+
 
 class StreamProcessorService:
     """
@@ -40,6 +50,7 @@ class StreamProcessorService:
         self.consumer: KafkaConsumer | None = None
         self.repository: TradeRepository | None = None
         self.aggregator: CandleAggregator | None = None
+        self.redis_client: redis.Redis | None = None
         self._running = False
         self._tasks: list[asyncio.Task] = []
         
@@ -47,15 +58,24 @@ class StreamProcessorService:
         self.trades_processed = 0
         self.candles_produced = 0
         self.last_trade_time: datetime | None = None
+        
+        # Symbols seen by this process, used to register new symbols once
+        self._known_symbols: set[str] = set()
     
     async def start(self) -> None:
         """Start the stream processor service."""
         logger.info("starting_stream_processor")
         
+        # Compile the candle kernel before the first flush
+        warm_up_kernels()
+        
         # Initialize repository
         self.repository = TradeRepository()
         await self.repository.connect()
         
+        # Connect to Redis
+        self.redis_client = redis.from_url(settings.redis_url)
+        
         # Initialize aggregator
         self.aggregator = CandleAggregator(
             repository=self.repository,
@@ -103,52 +123,38 @@ class StreamProcessorService:
         if self.repository:
             await self.repository.close()
         
+        if self.redis_client:
+            await self.redis_client.close()
+        
         logger.info("stream_processor_stopped")
     
     async def _trade_consumer_loop(self) -> None:
         """Background loop that consumes and processes trades."""
         logger.info("trade_consumer_loop_started")
         
-        batch: list[Trade] = []
-        batch_size = 100
-        
         while self._running:
             try:
-                async for msg in self.consumer.messages():
-                    if not self._running:
-                        break
-                    
+                messages = await self.consumer.getmany(
+                    timeout_ms=CONSUMER_POLL_TIMEOUT_MS,
+                    max_records=CONSUMER_MAX_RECORDS,
+                )
+                if not messages:
+                    continue
+                
+                metrics.kafka_messages_received.labels(
+                    topic=settings.topic_trades,
+                    consumer_group="stream-processor-group",
+                ).inc(len(messages))
+                
+                batch: list[Trade] = []
+                completed: list[CandleBuilder] = []
+                # First trade of each symbol not yet registered, by symbol
+                new_symbol_trades: dict[str, Trade] = {}
+                
+                for msg in messages:
                     try:
                         # Deserialize trade
-                        trade = Trade.from_json(msg["value"])
-                        
-                        # Update metrics
-                        metrics.trades_processed.labels(
-                            symbol=trade.symbol,
-                            processor="stream-processor",
-                        ).inc()
-                        
-                        metrics.kafka_messages_received.labels(
-                            topic=settings.topic_trades,
-                            consumer_group="stream-processor-group",
-                        ).inc()
-                        
-                        # Add to aggregator
-                        await self.aggregator.add_trade(trade)
-                        
-                        # Batch for DB insert
-                        batch.append(trade)
-                        
-                        if len(batch) >= batch_size:
-                            # Insert batch to DB
-                            await self.repository.insert_trades(batch)
-                            batch = []
-                            
-                            # Commit offsets
-                            await self.consumer.commit()
-                        
-                        self.trades_processed += 1
-                        self.last_trade_time = trade.timestamp
+                        batch.append(Trade.from_json(msg["value"]))
                         
                     except Exception as e:
                         logger.exception(
@@ -157,15 +163,74 @@ class StreamProcessorService:
                             offset=msg["offset"],
                         )
                 
+                if not batch:
+                    await self.consumer.commit()
+                    continue
+                
+                # Persist the trades before they touch the aggregator, so a
+                # failed insert leaves no state behind and the batch can be
+                # fetched again instead of being committed past
+                try:
+                    await self.repository.insert_trades(batch)
+                except Exception as e:
+                    logger.exception("trade_batch_insert_error", trades=len(batch), error=str(e))
+                    self.consumer.rewind(messages)
+                    await asyncio.sleep(1)  # Back off before refetching
+                    continue
+                
+                self.trades_processed += len(batch)
+                self.last_trade_time = batch[-1].timestamp
+                
+                for trade in batch:
+                    # Update metrics
+                    metrics.trades_processed.labels(
+                        symbol=trade.symbol,
+                        processor="stream-processor",
+                    ).inc()
+                    
+                    # Add to aggregator
+                    completed.extend(self.aggregator.add_trade(trade))
+                    
+                    if (
+                        trade.symbol not in self._known_symbols
+                        and trade.symbol not in new_symbol_trades
+                    ):
+                        new_symbol_trades[trade.symbol] = trade
+                
+                if completed:
+                    self.candles_produced += await self.aggregator.flush_builders(completed)
+                
+                if new_symbol_trades:
+                    await self._register_symbols(list(new_symbol_trades.values()))
+                
+                # One offset commit per persisted batch
+                await self.consumer.commit()
+                
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.exception("consumer_loop_error", error=str(e))
                 await asyncio.sleep(1)  # Back off on error
+    
+    async def _register_symbols(self, trades: list[Trade]) -> None:
+        """
+        Record first trades of new symbols and drop the cached symbol list.
+        
+        Symbols are only marked known once both steps succeed; on failure
+        they are retried with their next trade.
+        """
+        try:
+            await self.repository.register_symbols(trades)
+            await self.redis_client.delete(SYMBOLS_CACHE_KEY)
+        except Exception as e:
+            logger.warning(
+                "symbol_register_deferred",
+                symbols=[trade.symbol for trade in trades],
+                error=str(e),
+            )
+            return
         
-        # Insert remaining batch
-        if batch:
-            await self.repository.insert_trades(batch)
+        self._known_symbols.update(trade.symbol for trade in trades)
     
     async def _candle_flush_loop(self) -> None:
         """Periodically flush completed candles to database."""
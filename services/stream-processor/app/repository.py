@@ -19,6 +19,39 @@ logger = get_logger(__name__)
 metrics = get_metrics()
 settings = get_settings()
 
+# Trade columns in the order records are built for COPY
+TRADE_COLUMNS = ("symbol", "timestamp", "trade_id", "price", "quantity", "side", "exchange")
+
+# Replaces a stored candle with a complete one for its bucket
+CANDLE_UPSERT_SQL = """
+    INSERT INTO candles (timestamp, symbol, interval, open, high, low, close, volume, trade_count, vwap)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+    ON CONFLICT (timestamp, symbol, interval) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        trade_count = EXCLUDED.trade_count,
+        vwap = EXCLUDED.vwap
+"""
+
+# Folds the later trades of a bucket into the part already stored
+CANDLE_MERGE_SQL = """
+    INSERT INTO candles (timestamp, symbol, interval, open, high, low, close, volume, trade_count, vwap)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+    ON CONFLICT (timestamp, symbol, interval) DO UPDATE SET
+        high = GREATEST(candles.high, EXCLUDED.high),
+        low = LEAST(candles.low, EXCLUDED.low),
+        close = EXCLUDED.close,
+        volume = candles.volume + EXCLUDED.volume,
+        trade_count = candles.trade_count + EXCLUDED.trade_count,
+        vwap = (
+            COALESCE(candles.vwap, candles.close) * candles.volume
+            + COALESCE(EXCLUDED.vwap, EXCLUDED.close) * EXCLUDED.volume
+        ) / NULLIF(candles.volume + EXCLUDED.volume, 0)
+"""
+
 
 class TradeRepository:
     """
@@ -44,10 +77,21 @@ class TradeRepository:
             min_size=5,
             max_size=settings.timescale_pool_size,
             command_timeout=30,
+            init=self._init_connection,
         )
         
         logger.info("database_connected")
     
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        """Create the per-connection staging table used for bulk trade loads."""
+        await conn.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS trades_staging
+                (LIKE trades INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+            """
+        )
+    
     async def close(self) -> None:
         """Close connection pool."""
         if self.pool:
@@ -58,6 +102,10 @@ class TradeRepository:
         """
         Batch insert trades.
         
+        Rows are streamed into a temporary staging table with binary COPY,
+        then moved into ``trades`` in the same transaction so duplicates
+        are still skipped by the primary key.
+        
         Args:
             trades: List of trades to insert
             
@@ -69,7 +117,8 @@ class TradeRepository:
         
         query = """
             INSERT INTO trades (symbol, timestamp, trade_id, price, quantity, side, exchange)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            SELECT symbol, timestamp, trade_id, price, quantity, side, exchange
+            FROM trades_staging
             ON CONFLICT (symbol, timestamp, trade_id) DO NOTHING
         """
         
@@ -78,7 +127,7 @@ class TradeRepository:
                 trade.symbol,
                 trade.timestamp,
                 trade.trade_id,
-                float(trade.price),
+                trade.price,
                 trade.quantity,
                 trade.side.value,
                 trade.exchange,
@@ -88,7 +137,13 @@ class TradeRepository:
         
         try:
             async with self.pool.acquire() as conn:
-                await conn.executemany(query, records)
+                async with conn.transaction():
+                    await conn.copy_records_to_table(
+                        "trades_staging",
+                        records=records,
+                        columns=TRADE_COLUMNS,
+                    )
+                    await conn.execute(query)
             
             metrics.db_queries.labels(
                 operation="insert",
@@ -101,47 +156,88 @@ class TradeRepository:
             logger.exception("trade_insert_error", error=str(e))
             raise
     
-    async def insert_candle(self, candle: Candle) -> None:
+    async def register_symbols(self, trades: List[Trade]) -> None:
         """
-        Insert or update a candle.
+        Mark symbols as traded in the symbols table.
+        
+        Unknown symbols are added with placeholder reference data; known
+        ones only get ``first_trade_at`` set if it is still empty.
         
         Args:
-            candle: Candle to insert
+            trades: First trade seen for each symbol
         """
         query = """
-            INSERT INTO candles (timestamp, symbol, interval, open, high, low, close, volume, trade_count, vwap)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-            ON CONFLICT (timestamp, symbol, interval) DO UPDATE SET
-                open = EXCLUDED.open,
-                high = EXCLUDED.high,
-                low = EXCLUDED.low,
-                close = EXCLUDED.close,
-                volume = EXCLUDED.volume,
-                trade_count = EXCLUDED.trade_count,
-                vwap = EXCLUDED.vwap
+            INSERT INTO symbols (symbol, name, exchange, asset_type, first_trade_at)
+            VALUES ($1, $1, $2, 'STOCK', $3)
+            ON CONFLICT (symbol) DO UPDATE
+                SET first_trade_at = EXCLUDED.first_trade_at
+                WHERE symbols.first_trade_at IS NULL
         """
         
+        records = [(trade.symbol, trade.exchange, trade.timestamp) for trade in trades]
+        
         try:
             async with self.pool.acquire() as conn:
-                await conn.execute(
-                    query,
-                    candle.timestamp,
-                    candle.symbol,
-                    candle.interval,
-                    float(candle.open),
-                    float(candle.high),
-                    float(candle.low),
-                    float(candle.close),
-                    candle.volume,
-                    candle.trade_count,
-                    float(candle.vwap) if candle.vwap else None,
-                )
+                await conn.executemany(query, records)
+            
+            metrics.db_queries.labels(
+                operation="upsert",
+                table="symbols",
+            ).inc()
+            
+        except Exception as e:
+            logger.exception("symbol_register_error", error=str(e))
+            raise
+    
+    async def insert_candles(self, candles: List[Candle], merge: bool = False) -> int:
+        """
+        Insert or update several candles in one batch.
+        
+        By default a stored candle is overwritten, so writing the same
+        candle again (a retried flush, a Kafka redelivery) is idempotent.
+        With ``merge`` the candles continue buckets whose earlier trades
+        were already written by an early flush (LRU eviction), and are
+        folded into the stored rows instead.
+        
+        Args:
+            candles: Candles to insert
+            merge: Combine with stored rows rather than replace them
+            
+        Returns:
+            Number of upserted candles
+        """
+        if not candles:
+            return 0
+        
+        query = CANDLE_MERGE_SQL if merge else CANDLE_UPSERT_SQL
+        
+        records = [
+            (
+                candle.timestamp,
+                candle.symbol,
+                candle.interval,
+                float(candle.open),
+                float(candle.high),
+                float(candle.low),
+                float(candle.close),
+                candle.volume,
+                candle.trade_count,
+                float(candle.vwap) if candle.vwap else None,
+            )
+            for candle in candles
+        ]
+        
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.executemany(query, records)
             
             metrics.db_queries.labels(
                 operation="upsert",
                 table="candles",
             ).inc()
             
+            return len(candles)
+            
         except Exception as e:
             logger.exception("candle_insert_error", error=str(e))
             raise
@@ -0,0 +1,131 @@
+"""
+Tests for the OHLCV candle aggregator.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from finstream_common.models import Candle, Trade, OrderSide
+
+from app.aggregator import CandleAggregator
+
+
+class CandleStore:
+    """In-memory stand-in for TradeRepository.insert_candles' upserts."""
+    
+    def __init__(self) -> None:
+        self.rows: dict[tuple, dict] = {}
+    
+    async def insert_candles(self, candles: list[Candle], merge: bool = False) -> int:
+        for candle in candles:
+            key = (candle.timestamp, candle.symbol, candle.interval)
+            row = self.rows.get(key)
+            if row is None or not merge:
+                self.rows[key] = {
+                    "open": candle.open,
+                    "high": candle.high,
+                    "low": candle.low,
+                    "close": candle.close,
+                    "volume": candle.volume,
+                    "trade_count": candle.trade_count,
+                    "vwap": candle.vwap,
+                }
+                continue
+            
+            volume = row["volume"] + candle.volume
+            row["vwap"] = (
+                row["vwap"] * row["volume"] + candle.vwap * candle.volume
+            ) / volume
+            row["high"] = max(row["high"], candle.high)
+            row["low"] = min(row["low"], candle.low)
+            row["close"] = candle.close
+            row["volume"] = volume
+            row["trade_count"] += candle.trade_count
+        return len(candles)
+
+
+def _trade(symbol: str, price: str, quantity: int, timestamp: datetime) -> Trade:
+    return Trade(
+        symbol=symbol,
+        price=Decimal(price),
+        quantity=quantity,
+        side=OrderSide.BUY,
+        timestamp=timestamp,
+    )
+
+
+def test_evicted_symbol_merges_with_later_trades_in_same_bucket() -> None:
+    repository = CandleStore()
+    aggregator = CandleAggregator(repository, intervals=["1m"], max_symbols=1)
+    bucket = datetime(2024, 1, 2, 15, 30)
+    
+    trades = [
+        _trade("AAPL", "100", 10, bucket + timedelta(seconds=1)),
+        _trade("AAPL", "105", 30, bucket + timedelta(seconds=2)),
+    ]
+    later = [
+        _trade("AAPL", "95", 20, bucket + timedelta(seconds=40)),
+        _trade("AAPL", "101", 40, bucket + timedelta(seconds=50)),
+    ]
+    
+    async def run() -> None:
+        completed = []
+        for trade in trades:
+            completed += aggregator.add_trade(trade)
+        # A second symbol evicts AAPL while its bucket is still open
+        completed += aggregator.add_trade(
+            _trade("MSFT", "300", 5, bucket + timedelta(seconds=3))
+        )
+        assert [b.symbol for b in completed] == ["AAPL"]
+        await aggregator.flush_builders(completed)
+        
+        for trade in later:
+            await aggregator.flush_builders(aggregator.add_trade(trade))
+        await aggregator.flush_all()
+    
+    asyncio.run(run())
+    
+    row = repository.rows[(bucket, "AAPL", "1m")]
+    assert row["open"] == Decimal("100")
+    assert row["high"] == Decimal("105")
+    assert row["low"] == Decimal("95")
+    assert row["close"] == Decimal("101")
+    assert row["volume"] == 100
+    assert row["trade_count"] == 4
+    assert row["vwap"] == Decimal("100.9")
+
+
+def test_flushing_the_same_builder_twice_is_idempotent() -> None:
+    repository = CandleStore()
+    aggregator = CandleAggregator(repository, intervals=["1m"])
+    bucket = datetime(2024, 1, 2, 15, 30)
+    
+    async def run() -> None:
+        aggregator.add_trade(_trade("AAPL", "100", 10, bucket))
+        aggregator.add_trade(_trade("AAPL", "102", 30, bucket + timedelta(seconds=5)))
+        completed = aggregator.add_trade(
+            _trade("AAPL", "101", 1, bucket + timedelta(minutes=1))
+        )
+        assert len(completed) == 1
+        await aggregator.flush_builders(completed)
+        await aggregator.flush_builders(completed)
+    
+    asyncio.run(run())
+    
+    row = repository.rows[(bucket, "AAPL", "1m")]
+    assert row["volume"] == 40
+    assert row["trade_count"] == 2
+    assert row["vwap"] == Decimal("101.5")
+
+
+def test_prices_keep_the_trade_precision() -> None:
+    aggregator = CandleAggregator(CandleStore(), intervals=["1m"])
+    bucket = datetime(2024, 1, 2, 15, 30)
+    aggregator.add_trade(_trade("AAPL", "185.12", 10, bucket))
+    aggregator.add_trade(_trade("AAPL", "185.5", 10, bucket + timedelta(seconds=1)))
+    
+    current = aggregator.get_current_candles()["1m"]["AAPL"]
+    assert current["open"] == "185.12"
+    assert current["high"] == "185.50"
+    assert current["close"] == "185.50"
@@ -8,12 +8,13 @@ from contextlib import asynccontextmanager
 from typing import Any, TypeVar
 
 import orjson
-from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, TopicPartition
 from aiokafka.errors import KafkaError
 from pydantic import BaseModel
 
 from finstream_common.config import Settings, get_settings
 from finstream_common.logging import get_logger
+from finstream_common.models import dump_model_json
 
 logger = get_logger(__name__)
 
@@ -33,9 +34,26 @@ class KafkaProducer:
         self,
         bootstrap_servers: str | None = None,
         settings: Settings | None = None,
+        linger_ms: int | None = None,
+        max_batch_size: int | None = None,
     ) -> None:
+        """
+        Args:
+            bootstrap_servers: Kafka brokers (defaults to settings)
+            settings: Settings instance (defaults to get_settings())
+            linger_ms: Batching delay override for bursty producers
+            max_batch_size: Per-partition batch size override in bytes
+        """
         self._settings = settings or get_settings()
         self._bootstrap_servers = bootstrap_servers or self._settings.kafka_bootstrap_servers
+        self._linger_ms = (
+            linger_ms if linger_ms is not None else self._settings.kafka_producer_linger_ms
+        )
+        self._max_batch_size = (
+            max_batch_size
+            if max_batch_size is not None
+            else self._settings.kafka_producer_batch_size
+        )
         self._producer: AIOKafkaProducer | None = None
         self._started = False
 
@@ -47,10 +65,10 @@ class KafkaProducer:
         self._producer = AIOKafkaProducer(
             bootstrap_servers=self._bootstrap_servers,
             acks=self._settings.kafka_producer_acks,
-            linger_ms=self._settings.kafka_producer_linger_ms,
-            max_batch_size=self._settings.kafka_producer_batch_size,
+            linger_ms=self._linger_ms,
+            max_batch_size=self._max_batch_size,
             compression_type=self._settings.kafka_producer_compression_type,
-            key_serializer=lambda k: k.encode("utf-8") if k else None,
+            key_serializer=lambda k: k.encode("utf-8") if isinstance(k, str) else k,
             value_serializer=lambda v: v if isinstance(v, bytes) else v.encode("utf-8"),
         )
 
@@ -72,7 +90,7 @@ class KafkaProducer:
         self,
         topic: str,
         value: bytes | str,
-        key: str | None = None,
+        key: bytes | str | None = None,
         headers: list[tuple[str, bytes]] | None = None,
         partition: int | None = None,
     ) -> None:
@@ -82,7 +100,7 @@ class KafkaProducer:
         Args:
             topic: Target topic name
             value: Message value (bytes or string)
-            key: Message key for partitioning
+            key: Message key for partitioning (bytes are sent as-is)
             headers: Optional message headers
             partition: Specific partition (optional)
         """
@@ -102,6 +120,13 @@ class KafkaProducer:
             logger.error("kafka_send_failed", topic=topic, key=key, error=str(e))
             raise
 
+    async def flush(self) -> None:
+        """Wait until every queued message has been delivered."""
+        if not self._started:
+            raise RuntimeError("Producer not started. Call start() first.")
+
+        await self._producer.flush()
+
     async def send_batch(
         self,
         topic: str,
@@ -118,7 +143,7 @@ class KafkaProducer:
             await self.send(topic, value, key)
 
         # Flush to ensure delivery
-        await self._producer.flush()
+        await self.flush()
 
     async def send_model(
         self,
@@ -136,7 +161,7 @@ class KafkaProducer:
             key: Message key
             headers: Optional headers
         """
-        value = orjson.dumps(model.model_dump(mode="json"))
+        value = dump_model_json(model)
         await self.send(topic, value, key, headers)
 
     async def __aenter__(self) -> "KafkaProducer":
@@ -219,15 +244,51 @@ class KafkaConsumer:
             raise RuntimeError("Consumer not started. Call start() first.")
 
         async for msg in self._consumer:
-            yield {
-                "topic": msg.topic,
-                "partition": msg.partition,
-                "offset": msg.offset,
-                "key": msg.key,
-                "value": msg.value,
-                "timestamp": msg.timestamp,
-                "headers": dict(msg.headers) if msg.headers else {},
-            }
+            yield self._to_dict(msg)
+
+    async def getmany(
+        self,
+        timeout_ms: int = 100,
+        max_records: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch a batch of messages across all assigned partitions.
+
+        Returns as soon as records are available, or after ``timeout_ms``
+        with an empty list. Records keep per-partition order.
+
+        Args:
+            timeout_ms: Maximum time to wait for records
+            max_records: Maximum records to return (defaults to max_poll_records)
+
+        Returns:
+            List of message dicts in the same shape as ``messages()`` yields
+        """
+        if not self._started:
+            raise RuntimeError("Consumer not started. Call start() first.")
+
+        records = await self._consumer.getmany(
+            timeout_ms=timeout_ms,
+            max_records=max_records,
+        )
+        return [
+            self._to_dict(msg)
+            for partition_records in records.values()
+            for msg in partition_records
+        ]
+
+    @staticmethod
+    def _to_dict(msg: Any) -> dict[str, Any]:
+        """Convert an aiokafka ConsumerRecord to a message dict."""
+        return {
+            "topic": msg.topic,
+            "partition": msg.partition,
+            "offset": msg.offset,
+            "key": msg.key,
+            "value": msg.value,
+            "timestamp": msg.timestamp,
+            "headers": dict(msg.headers) if msg.headers else {},
+        }
 
     async def messages_as(
         self,
@@ -263,6 +324,28 @@ class KafkaConsumer:
             await self._consumer.commit()
             logger.debug("kafka_offsets_committed")
 
+    def rewind(self, messages: list[dict[str, Any]]) -> None:
+        """
+        Seek back so the given messages are fetched again.
+
+        Used when a fetched batch could not be persisted, so the next
+        ``commit()`` cannot move the group offset past it.
+
+        Args:
+            messages: Message dicts as returned by ``getmany()``
+        """
+        if not self._consumer:
+            return
+
+        first: dict[tuple[str, int], int] = {}
+        for msg in messages:
+            key = (msg["topic"], msg["partition"])
+            if key not in first or msg["offset"] < first[key]:
+                first[key] = msg["offset"]
+
+        for (topic, partition), offset in first.items():
+            self._consumer.seek(TopicPartition(topic, partition), offset)
+
     async def seek_to_beginning(self) -> None:
         """Seek to beginning of all assigned partitions."""
         if self._consumer:
@@ -269,6 +269,13 @@ class FinStreamMetrics:
             registry=self.registry,
         )
 
+        self.ws_messages_dropped = Counter(
+            "finstream_ws_messages_dropped_total",
+            "WebSocket messages dropped because a client fell behind",
+            ["channel"],
+            registry=self.registry,
+        )
+
     def timed(
         self,
         operation: str,
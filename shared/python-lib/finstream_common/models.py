@@ -17,6 +17,22 @@ def orjson_dumps(v: Any, *, default: Any) -> str:
     return orjson.dumps(v, default=default).decode()
 
 
+def dump_model_json(model: BaseModel) -> bytes:
+    """
+    Serialize a model to JSON bytes.
+
+    Dumps in Python mode and lets orjson encode datetimes, enums, UUIDs and
+    NumPy scalars natively; Decimals fall through to ``str``. The output
+    matches ``orjson.dumps(model.model_dump(mode="json"))`` without pydantic
+    building the intermediate JSON-mode dict.
+    """
+    return orjson.dumps(
+        model.model_dump(),
+        default=str,
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
 class BaseEvent(BaseModel):
     """Base class for all events with common fields."""
 
@@ -29,12 +45,17 @@ class BaseEvent(BaseModel):
 
     def to_json(self) -> bytes:
         """Serialize to JSON bytes for Kafka."""
-        return orjson.dumps(self.model_dump(mode="json"))
+        return dump_model_json(self)
 
     @classmethod
     def from_json(cls, data: bytes) -> "BaseEvent":
-        """Deserialize from JSON bytes."""
-        return cls.model_validate(orjson.loads(data))
+        """
+        Deserialize from JSON bytes.
+
+        Parses straight into the model with pydantic-core's JSON parser,
+        without building an intermediate dict.
+        """
+        return cls.model_validate_json(data)
 
 
 # =============================================================================